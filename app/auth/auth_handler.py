@@ -1,141 +1,261 @@
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from datetime import timedelta
+from typing import Optional, Dict, Any, Tuple
+from cachetools import TTLCache
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import jwt
 from app.config import settings
 from app.database import get_database
 from app.models.user import TokenData, User
+from app.utils.request_helpers import cached_object_id
 from bson import ObjectId
+import asyncio
+import bcrypt
+import concurrent.futures
+import hashlib
+import hmac
 import logging
+import os
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing; bcrypt only looks at the first 72 bytes of a password
+_BCRYPT_MAX_BYTES = 72
+
+def _bcrypt_hash(password: str) -> str:
+    """Hash a password with bcrypt at the configured cost"""
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds, prefix=b"2b")
+    return bcrypt.hashpw(password.encode()[:_BCRYPT_MAX_BYTES], salt).decode()
+
+def _bcrypt_verify(password: str, hashed_password: str) -> bool:
+    """Check a password against a bcrypt hash; malformed hashes never match"""
+    try:
+        return bcrypt.checkpw(password.encode()[:_BCRYPT_MAX_BYTES], hashed_password.encode())
+    except ValueError:
+        return False
+
+# Successful bcrypt verifies, remembered as an HMAC of the password keyed per
+# stored hash. Memory only; the on-disk bcrypt hash is unchanged.
+_password_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+_password_cache_lock = threading.Lock()
+
+# Verified against on unknown emails so misses cost the same as hits
+_DUMMY_HASH = _bcrypt_hash("dummy")
+
+# bcrypt is CPU bound; keep it off the event loop
+_BCRYPT_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="bcrypt")
 
 # JWT token bearer
 security = HTTPBearer()
 
+# JWT signing material and decode options, resolved once at import
+_ALGO = settings.algorithm
+_ALGORITHMS = [_ALGO]
+_KEY = settings.secret_key.encode()
+_DECODE_OPTIONS = {"require": ["exp", "sub"], "verify_aud": False}
+_jwt = jwt.PyJWT()
+
+# Verified tokens: blake2b(token) -> (email, exp). Only the signature check is
+# cached; every hit still resolves the user through _user_cache. Entries never
+# outlive the token's own exp and are capped at _TOKEN_CACHE_MAX_TTL seconds.
+_TOKEN_CACHE_MAX_TTL = 300
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=_TOKEN_CACHE_MAX_TTL)
+
+# Users by email. invalidate_cached_user applies at once in this process;
+# changes made elsewhere (other processes, is_active flips directly in Mongo)
+# reach every request, cached token or not, within 60s.
+_user_cache: TTLCache = TTLCache(maxsize=2048, ttl=60)
+
+def invalidate_cached_user(email: Optional[str] = None, user_id: Optional[str] = None) -> None:
+    """Drop cached user data after a user document changes; no args clears all"""
+    if email is None and user_id is None:
+        _user_cache.clear()
+        return
+    
+    for key, user in list(_user_cache.items()):
+        if user.email == email or user.id == user_id:
+            _user_cache.pop(key, None)
+
+# Workspace roles by (user_id, workspace_id). Membership changes made through
+# the workspace routes invalidate entries; otherwise they expire after 60s.
+_workspace_role_cache: TTLCache = TTLCache(maxsize=100_000, ttl=60)
+
+def invalidate_workspace_access(workspace_id: Optional[str] = None) -> None:
+    """Drop cached workspace roles for one workspace; no args clears all"""
+    if workspace_id is None:
+        _workspace_role_cache.clear()
+        return
+    
+    for key in [key for key in list(_workspace_role_cache.keys()) if key[1] == workspace_id]:
+        _workspace_role_cache.pop(key, None)
+
+def _token_cache_key(token: str) -> bytes:
+    """Hash the raw token so it is never held verbatim in memory"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def _get_cached_token_email(key: bytes) -> Optional[str]:
+    """Return the cached subject for a token digest if its exp has not passed"""
+    entry: Optional[Tuple[str, float]] = _token_cache.get(key)
+    if entry is None:
+        return None
+    email, exp = entry
+    if exp <= time.time():
+        _token_cache.pop(key, None)
+        return None
+    return email
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    key = hmac.new(settings.secret_key.encode(), hashed_password.encode(), "sha256").digest()
+    probe = hmac.new(key, plain_password.encode(), "sha256").digest()
+
+    with _password_cache_lock:
+        cached = _password_cache.get(key)
+    if cached is not None and hmac.compare_digest(cached, probe):
+        return True
+
+    if not _bcrypt_verify(plain_password, hashed_password):
+        return False
+
+    with _password_cache_lock:
+        _password_cache[key] = probe
+    return True
 
 def get_password_hash(password: str) -> str:
     """Generate password hash"""
-    return pwd_context.hash(password)
+    return _bcrypt_hash(password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate password hash on the bcrypt pool so the event loop keeps serving"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BCRYPT_POOL, _bcrypt_hash, password)
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
-    return encoded_jwt
+    exp = int(time.time()) + int((expires_delta or timedelta(minutes=15)).total_seconds())
+    return _jwt.encode({**data, "exp": exp}, _KEY, algorithm=_ALGO)
 
 async def authenticate_user(email: str, password: str) -> Optional[User]:
-    """Authenticate user with email and password"""
+    """Authenticate user with email and password; the returned User is a partial login view"""
     if not email or not password:
         return None
         
     db = get_database()
-    user_data = await db.users.find_one({"email": email.lower().strip()})
+    user_data = await db.users.find_one(
+        {"email": email.lower().strip()},
+        projection={"email": 1, "hashed_password": 1, "is_active": 1, "full_name": 1, "role": 1}
+    )
     
+    loop = asyncio.get_running_loop()
     if not user_data:
+        await loop.run_in_executor(_BCRYPT_POOL, _bcrypt_verify, password, _DUMMY_HASH)
         return None
     
     if not user_data.get("is_active", True):
         return None
     
-    if not verify_password(password, user_data["hashed_password"]):
+    if not await loop.run_in_executor(_BCRYPT_POOL, verify_password, password, user_data.pop("hashed_password")):
         return None
     
-    user_data["_id"] = str(user_data["_id"])
-    return User(**user_data)
+    # Trusted DB data: skip re-validation of the projected fields
+    user_data["id"] = str(user_data.pop("_id"))
+    return User.model_construct(**user_data)
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
     """Get current authenticated user"""
-    credentials_exception = HTTPException(
+    token = credentials.credentials
+    key = _token_cache_key(token)
+
+    email = _get_cached_token_email(key)
+    if email is None:
+        email, exp = _verify_token(token)
+        if exp - time.time() > 0:
+            _token_cache[key] = (email, min(exp, time.time() + _TOKEN_CACHE_MAX_TTL))
+
+    return await _load_user(email)
+
+def _credentials_exception() -> HTTPException:
+    """401 raised for any token or user lookup failure"""
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+def _verify_token(token: str) -> Tuple[str, float]:
+    """Decode the JWT and return its subject and exp; raises 401 on any failure"""
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        payload = _jwt.decode(token, _KEY, algorithms=_ALGORITHMS, options=_DECODE_OPTIONS)
         email: str = payload.get("sub")
         if email is None:
-            raise credentials_exception
+            raise _credentials_exception()
         token_data = TokenData(email=email)
-    except JWTError:
-        raise credentials_exception
+        exp = float(payload.get("exp", 0))
+    except (jwt.PyJWTError, TypeError, ValueError):
+        raise _credentials_exception()
     
-    db = get_database()
-    user_data = await db.users.find_one({"email": token_data.email})
+    return token_data.email, exp
+
+async def _load_user(email: str) -> User:
+    """Load the user for a verified token, cached; raises 401 if missing or inactive"""
+    user = _user_cache.get(email)
+    if user is None:
+        db = get_database()
+        user_data = await db.users.find_one({"email": email}, projection={"hashed_password": 0})
+        
+        if user_data is None:
+            raise _credentials_exception()
+        
+        user_data["_id"] = str(user_data["_id"])
+        user = User(**user_data)
+        _user_cache[email] = user
     
-    if user_data is None:
-        raise credentials_exception
+    if not user.is_active:
+        raise _credentials_exception()
     
-    user_data["_id"] = str(user_data["_id"])
-    return User(**user_data)
+    return user
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
-    """Get current active user"""
-    if not current_user.is_active:
-        raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user
+async def _get_workspace_role(user: User, workspace_id: str) -> str:
+    """Resolve the user's role, cached, with a single projected membership query"""
+    cache_key = (user.id, workspace_id)
+    role = _workspace_role_cache.get(cache_key)
+    if role is None:
+        role = await _fetch_workspace_role(user, workspace_id)
+        _workspace_role_cache[cache_key] = role
+    return role
 
-async def verify_workspace_access(user: User, workspace_id: str) -> bool:
-    """Verify if user has access to workspace"""
+async def _fetch_workspace_role(user: User, workspace_id: str) -> str:
+    """Query the user's role in a workspace"""
     db = get_database()
-    workspace = await db.workspaces.find_one({"_id": ObjectId(workspace_id)})
+    user_oid = cached_object_id(user.id)
+    workspace = await db.workspaces.find_one(
+        {
+            "_id": cached_object_id(workspace_id),
+            "$or": [{"admin_id": user_oid}, {"member_ids": user_oid}]
+        },
+        projection={"admin_id": 1}
+    )
     
     if not workspace:
-        return False
-    
-    # Check if user is admin or member
-    if str(workspace["admin_id"]) == user.id:
-        return True
+        return "none"
     
-    if user.id in [str(member_id) for member_id in workspace.get("member_ids", [])]:
-        return True
+    if workspace.get("admin_id") == user_oid:
+        return "admin"
     
-    return False
+    return "member"
+
+async def verify_workspace_access(user: User, workspace_id: str) -> bool:
+    """Verify if user has access to workspace"""
+    return await _get_workspace_role(user, workspace_id) != "none"
 
 async def verify_workspace_admin(user: User, workspace_id: str) -> bool:
     """Verify if user is admin of workspace"""
-    logger.info(f"Verifying admin access for user {user.id} in workspace {workspace_id}")
-    
-    db = get_database()
-    workspace = await db.workspaces.find_one({"_id": ObjectId(workspace_id)})
-    
-    if not workspace:
-        logger.warning(f"Workspace {workspace_id} not found")
-        return False
-    
-    # Check if user is admin
-    is_admin = str(workspace["admin_id"]) == user.id
-    logger.info(f"Admin check: workspace admin_id={workspace['admin_id']}, user_id={user.id}, is_admin={is_admin}")
+    is_admin = await _get_workspace_role(user, workspace_id) == "admin"
+    logger.debug(f"Admin check: workspace_id={workspace_id}, user_id={user.id}, is_admin={is_admin}")
     return is_admin
 
 async def get_user_role_in_workspace(user: User, workspace_id: str) -> str:
     """Get user role in workspace (admin, member, or none)"""
-    db = get_database()
-    workspace = await db.workspaces.find_one({"_id": ObjectId(workspace_id)})
-    
-    if not workspace:
-        return "none"
-    
-    if str(workspace["admin_id"]) == user.id:
-        return "admin"
-    
-    if user.id in [str(member_id) for member_id in workspace.get("member_ids", [])]:
-        return "member"
-    
-    return "none"
\ No newline at end of file
+    return await _get_workspace_role(user, workspace_id)
@@ -1,53 +1,67 @@
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
-import os
 from dotenv import load_dotenv
+import os
 
+# Settings read .env themselves; this keeps os.getenv lookups of per-workspace
+# keys (WORKSPACE_<id>_EMAIL) working elsewhere in the app.
 load_dotenv()
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    
     # Database
-    mongodb_url: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
-    database_name: str = os.getenv("DATABASE_NAME", "whatsapp_automation")
+    mongodb_url: str = "mongodb://localhost:27017"
+    database_name: str = "whatsapp_automation"
+    mongodb_pool_size: int = 100
+    mongodb_min_pool_size: int = 10
+    mongodb_socket_timeout_ms: int = 30000
     
     # Redis
-    redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379")
+    redis_url: str = "redis://localhost:6379"
     
     # JWT
-    secret_key: str = os.getenv("SECRET_KEY", "your-secret-key-here")
+    secret_key: str = "your-secret-key-here"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    bcrypt_rounds: int = 12
     
     # OpenAI
-    openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
+    openai_api_key: str = ""
     
     # WhatsApp Node.js server
-    whatsapp_server_url: str = os.getenv("WHATSAPP_SERVER_URL", "http://localhost:3000")
+    whatsapp_server_url: str = "http://localhost:3000"
     
     # Email Settings
-    smtp_server: str = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-    smtp_port: int = int(os.getenv("SMTP_PORT", "587"))
-    smtp_username: str = os.getenv("SMTP_USERNAME", "")
-    smtp_password: str = os.getenv("SMTP_PASSWORD", "")
+    smtp_server: str = "smtp.gmail.com"
+    smtp_port: int = 587
+    smtp_username: str = ""
+    smtp_password: str = ""
     
     # File upload
-    max_file_size: int = int(os.getenv("MAX_FILE_SIZE", 10 * 1024 * 1024))  # 10MB default
+    max_file_size: int = 10 * 1024 * 1024  # 10MB default
     upload_dir: str = "uploads"
+    # Spool dir for blast Excel uploads; point at local disk or tmpfs, not a network mount
+    blast_tmpdir: Optional[str] = None  # None = system temp dir
+    blast_parse_concurrency: int = min(4, os.cpu_count() or 1)  # Excel parses in flight at once
     
     # Rate limiting
     rate_limit_requests: int = 100
     rate_limit_window: int = 60
     
     # Message Queue Settings
-    max_queue_size: int = int(os.getenv("MAX_QUEUE_SIZE", "1000"))
-    message_retry_attempts: int = int(os.getenv("MESSAGE_RETRY_ATTEMPTS", "3"))
-    message_timeout: int = int(os.getenv("MESSAGE_TIMEOUT", "300"))  # 5 minutes
+    max_queue_size: int = 1000
+    message_retry_attempts: int = 3
+    message_timeout: int = 300  # 5 minutes
     
     # Excel Export Settings
-    export_interval_minutes: int = int(os.getenv("EXPORT_INTERVAL_MINUTES", "15"))
-    export_cleanup_days: int = int(os.getenv("EXPORT_CLEANUP_DAYS", "7"))
-    
-    class Config:
-        env_file = ".env"
+    export_interval_minutes: int = 15
+    export_cleanup_days: int = 7
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the process-wide settings instance"""
+    return Settings()
 
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
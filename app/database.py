@@ -1,6 +1,7 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.config import settings
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,7 +15,16 @@ db = Database()
 async def connect_to_mongo():
     """Create database connection"""
     try:
-        db.client = AsyncIOMotorClient(settings.mongodb_url)
+        db.client = AsyncIOMotorClient(
+            settings.mongodb_url,
+            maxPoolSize=settings.mongodb_pool_size,
+            minPoolSize=min(settings.mongodb_min_pool_size, settings.mongodb_pool_size),
+            compressors="zstd,zlib",
+            zlibCompressionLevel=3,
+            serverSelectionTimeoutMS=5000,
+            socketTimeoutMS=settings.mongodb_socket_timeout_ms,
+            waitQueueTimeoutMS=1000
+        )
         db.database = db.client[settings.database_name]
         
         # Test connection
@@ -34,100 +44,127 @@ async def close_mongo_connection():
         db.client.close()
         logger.info("Disconnected from MongoDB")
 
+async def _ensure_documents_text_index():
+    """Replace the legacy title/description text index with one that also covers tags"""
+    documents = db.database.documents
+    # A collection can hold only one text index, so the old one must go first
+    if "title_text_description_text" in await documents.index_information():
+        await documents.drop_index("title_text_description_text")
+    await documents.create_index([("title", "text"), ("description", "text"), ("tags", "text")])
+
 async def create_indexes():
     """Create necessary database indexes"""
-    try:
+    index_tasks = [
         # Users collection indexes
-        await db.database.users.create_index("email", unique=True)
-        
+        db.database.users.create_index("email", unique=True),
+        db.database.users.create_index("is_admin", partialFilterExpression={"is_admin": True}),
+
         # Workspaces collection indexes
-        await db.database.workspaces.create_index("admin_id")
-        
+        db.database.workspaces.create_index("admin_id"),
+        db.database.workspaces.create_index([("_id", 1), ("member_ids", 1)]),
+        db.database.workspaces.create_index([("admin_id", 1), ("_id", 1)]),
+        db.database.workspace_ai_settings.create_index("workspace_id", unique=True),
+
         # Chats collection indexes
-        await db.database.chats.create_index([("workspace_id", 1), ("customer_phone", 1)])
-        await db.database.chats.create_index("workspace_id")
-        await db.database.chats.create_index("phone_number")
-        
+        db.database.chats.create_index([("workspace_id", 1), ("customer_phone", 1)]),
+        db.database.chats.create_index("workspace_id"),
+        db.database.chats.create_index("phone_number"),
+        db.database.chats.create_index([("status", 1), ("last_message_at", -1)]),
+        db.database.chats.create_index([("status", 1), ("updated_at", -1)]),
+        db.database.chats.create_index([("created_at", -1)]),
+
         # Messages collection indexes
-        await db.database.messages.create_index("chat_id")
-        await db.database.messages.create_index([("chat_id", 1), ("timestamp", -1)])
-        
+        db.database.messages.create_index("chat_id"),
+        db.database.messages.create_index([("chat_id", 1), ("timestamp", -1)]),
+        db.database.messages.create_index([("is_ai_generated", 1), ("timestamp", -1)]),
+        db.database.messages.create_index([("direction", 1), ("timestamp", -1)]),
+
         # Documents collection indexes
-        await db.database.documents.create_index("workspace_id")
-        await db.database.documents.create_index([("workspace_id", 1), ("status", 1)])
-        await db.database.documents.create_index([("workspace_id", 1), ("document_type", 1)])
-        await db.database.documents.create_index([("title", "text"), ("description", "text")])
-        
+        db.database.documents.create_index("workspace_id"),
+        db.database.documents.create_index([("workspace_id", 1), ("status", 1)]),
+        db.database.documents.create_index([("workspace_id", 1), ("document_type", 1)]),
+        db.database.documents.create_index([("workspace_id", 1), ("document_type", 1), ("status", 1)]),
+        _ensure_documents_text_index(),
+
         # Document chunks collection indexes
-        await db.database.document_chunks.create_index("document_id")
-        await db.database.document_chunks.create_index("workspace_id")
-        await db.database.document_chunks.create_index([("workspace_id", 1), ("document_id", 1)])
-        
+        db.database.document_chunks.create_index("document_id"),
+        db.database.document_chunks.create_index("workspace_id"),
+        db.database.document_chunks.create_index([("workspace_id", 1), ("document_id", 1)]),
+
         # Phone numbers collection indexes
-        await db.database.phone_numbers.create_index("workspace_id")
-        await db.database.phone_numbers.create_index("phone_number", unique=True)
-        
+        db.database.phone_numbers.create_index("workspace_id"),
+        db.database.phone_numbers.create_index("phone_number", unique=True),
+
         # Workflow steps collection indexes
-        await db.database.workflow_steps.create_index("workspace_id")
-        await db.database.workflow_steps.create_index([("workspace_id", 1), ("step_number", 1)])
-        
+        db.database.workflow_steps.create_index("workspace_id"),
+        db.database.workflow_steps.create_index([("workspace_id", 1), ("step_number", 1)]),
+
         # Chat workflow progress collection indexes
-        await db.database.chat_workflow_progress.create_index("chat_id", unique=True)
-        await db.database.chat_workflow_progress.create_index("workspace_id")
-        
+        db.database.chat_workflow_progress.create_index("chat_id", unique=True),
+        db.database.chat_workflow_progress.create_index("workspace_id"),
+
         # Audit logs collection indexes
-        await db.database.audit_logs.create_index("workspace_id")
-        await db.database.audit_logs.create_index("user_id")
-        await db.database.audit_logs.create_index("action")
-        await db.database.audit_logs.create_index("timestamp")
-        await db.database.audit_logs.create_index([("workspace_id", 1), ("action", 1), ("timestamp", -1)])
-        
+        db.database.audit_logs.create_index("workspace_id"),
+        db.database.audit_logs.create_index("user_id"),
+        db.database.audit_logs.create_index("action"),
+        db.database.audit_logs.create_index("timestamp"),
+        db.database.audit_logs.create_index([("workspace_id", 1), ("action", 1), ("timestamp", -1)]),
+
         # Message queue collection indexes
-        await db.database.message_queue.create_index("message_id", unique=True)
-        await db.database.message_queue.create_index("status")
-        await db.database.message_queue.create_index("created_at")
-        await db.database.message_queue.create_index([("status", 1), ("created_at", -1)])
-        await db.database.message_queue.create_index("phone_number")
-        
+        db.database.message_queue.create_index("message_id", unique=True),
+        db.database.message_queue.create_index("status"),
+        db.database.message_queue.create_index("created_at"),
+        db.database.message_queue.create_index([("status", 1), ("created_at", -1)]),
+        db.database.message_queue.create_index([("status", 1), ("retry_count", 1)]),
+        db.database.message_queue.create_index("phone_number"),
+        db.database.message_queue_hourly.create_index([("hour_bucket", 1), ("status", 1)], unique=True),
+        db.database.message_queue_hourly.create_index("refreshed_at"),
+
         # System logs collection indexes
-        await db.database.system_logs.create_index("timestamp")
-        await db.database.system_logs.create_index("type")
-        await db.database.system_logs.create_index("job_id")
-        
+        db.database.system_logs.create_index("timestamp"),
+        db.database.system_logs.create_index("type"),
+        db.database.system_logs.create_index("job_id"),
+        db.database.system_logs.create_index([("service", 1), ("timestamp", -1)]),
+
         # Export logs collection indexes
-        await db.database.export_logs.create_index("workspace_id")
-        await db.database.export_logs.create_index("export_type")
-        await db.database.export_logs.create_index("export_timestamp")
-        await db.database.export_logs.create_index([("workspace_id", 1), ("export_type", 1)], unique=True)
-        
+        db.database.export_logs.create_index("workspace_id"),
+        db.database.export_logs.create_index("export_type"),
+        db.database.export_logs.create_index("export_timestamp"),
+        db.database.export_logs.create_index([("workspace_id", 1), ("export_type", 1)], unique=True),
+        db.database.export_logs.create_index([("workspace_id", 1), ("export_timestamp", -1)]),
+
         # Message blasts collection indexes
-        await db.database.message_blasts.create_index("workspace_id")
-        await db.database.message_blasts.create_index("status")
-        await db.database.message_blasts.create_index("start_time")
-        await db.database.message_blasts.create_index([("workspace_id", 1), ("status", 1)])
-        await db.database.message_blasts.create_index([("workspace_id", 1), ("created_at", -1)])
-        
+        db.database.message_blasts.create_index("workspace_id"),
+        db.database.message_blasts.create_index("status"),
+        db.database.message_blasts.create_index("start_time"),
+        db.database.message_blasts.create_index([("workspace_id", 1), ("status", 1)]),
+        db.database.message_blasts.create_index([("workspace_id", 1), ("created_at", -1)]),
+
         # Blast targets collection indexes
-        await db.database.blast_targets.create_index("blast_id")
-        await db.database.blast_targets.create_index("status")
-        await db.database.blast_targets.create_index([("blast_id", 1), ("status", 1)])
-        await db.database.blast_targets.create_index([("blast_id", 1), ("batch_number", 1)])
-        
+        db.database.blast_targets.create_index("blast_id"),
+        db.database.blast_targets.create_index("status"),
+        db.database.blast_targets.create_index([("blast_id", 1), ("status", 1)]),
+        db.database.blast_targets.create_index([("blast_id", 1), ("batch_number", 1)]),
+
         # Email configurations collection indexes
-        await db.database.email_configs.create_index("workspace_id", unique=True)
-        await db.database.email_configs.create_index("status")
-        await db.database.email_configs.create_index([("workspace_id", 1), ("status", 1)])
-        
+        db.database.email_configs.create_index("workspace_id", unique=True),
+        db.database.email_configs.create_index("status"),
+        db.database.email_configs.create_index([("workspace_id", 1), ("status", 1)]),
+
         # Email logs collection indexes
-        await db.database.email_logs.create_index("workspace_id")
-        await db.database.email_logs.create_index("email_config_id")
-        await db.database.email_logs.create_index("sent_at")
-        await db.database.email_logs.create_index([("workspace_id", 1), ("sent_at", -1)])
-        
+        db.database.email_logs.create_index("workspace_id"),
+        db.database.email_logs.create_index("email_config_id"),
+        db.database.email_logs.create_index("sent_at"),
+        db.database.email_logs.create_index([("workspace_id", 1), ("sent_at", -1)]),
+    ]
+    
+    results = await asyncio.gather(*index_tasks, return_exceptions=True)
+    failures = [result for result in results if isinstance(result, Exception)]
+    for failure in failures:
+        logger.error(f"Failed to create index: {failure}")
+    
+    if not failures:
         logger.info("Database indexes created successfully")
-        
-    except Exception as e:
-        logger.error(f"Failed to create indexes: {e}")
 
 def get_database() -> AsyncIOMotorDatabase:
     """Get database instance"""
@@ -1,7 +1,7 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -12,13 +12,17 @@ from app.routes import exports
 from app.routes import message_blasts
 from app.routes import email_notifications
 from app.services.message_queue import message_queue
+from app.services.chat_service import chat_service
 from app.services.scheduler_service import scheduler_service
 from app.services.export_scheduler import export_scheduler
 from app.services.blast_scheduler_service import blast_scheduler_service
 from app.services.email_scheduler_service import email_scheduler_service
 import logging
+import orjson
+import os
 import uvicorn
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 import asyncio
 
 # Configure logging
@@ -28,6 +32,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pre-encoded body for unhandled errors
+_INTERNAL_ERROR_BODY = orjson.dumps({"detail": "Internal server error"})
+
 # Rate limiting
 limiter = Limiter(key_func=get_remote_address)
 
@@ -67,6 +74,7 @@ async def lifespan(app: FastAPI):
     await export_scheduler.stop()
     await scheduler_service.stop()
     await message_queue.close()
+    await chat_service.close()
     await close_mongo_connection()
     logger.info("Application shutdown complete")
 
@@ -75,6 +83,7 @@ app = FastAPI(
     title="WhatsApp Automation Backend",
     description="Backend API for WhatsApp automation system with AI chat capabilities",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -100,10 +109,11 @@ app.add_middleware(
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Global exception: {exc}")
-    return JSONResponse(
+    logger.exception("Global exception", exc_info=exc)
+    return Response(
+        content=_INTERNAL_ERROR_BODY,
         status_code=500,
-        content={"detail": "Internal server error"}
+        media_type="application/json"
     )
 
 # Health check endpoint
@@ -121,7 +131,7 @@ async def health_check():
         "message_queue": queue_stats,
         "scheduler": scheduler_status,
         "export_scheduler": export_status,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
 # Include routers
@@ -149,10 +159,16 @@ async def root():
     }
 
 if __name__ == "__main__":
+    debug = os.getenv("DEBUG") == "1"
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        loop="uvloop",
+        http="httptools",
+        reload=debug,
+        # The lifespan runs the schedulers, the queue consumer and per-process caches;
+        # more than one worker would duplicate jobs, so extra workers are opt-in only
+        workers=1 if debug else int(os.getenv("WEB_CONCURRENCY", "1")),
         log_level="info"
     )
\ No newline at end of file
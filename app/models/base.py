@@ -0,0 +1,14 @@
+from typing import Any, Dict, Type, TypeVar
+from bson import ObjectId
+
+ModelT = TypeVar("ModelT")
+
+class FromDBMixin:
+    """Build models from documents we just wrote to or read from Mongo without re-validating"""
+    
+    @classmethod
+    def from_db(cls: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+        """Construct the model skipping validation; only use on trusted, already-typed DB data"""
+        if isinstance(data.get("_id"), ObjectId):
+            data["_id"] = str(data["_id"])
+        return cls.model_construct(**data)
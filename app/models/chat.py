@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
+from app.models.base import FromDBMixin
 
 class ChatStatus(str, Enum):
     ACTIVE = "active"
@@ -20,6 +21,8 @@ class MessageDirection(str, Enum):
     OUTGOING = "outgoing"
 
 class MessageBase(BaseModel):
+    model_config = ConfigDict(extra="ignore", populate_by_name=True, frozen=True)
+
     content: str
     message_type: MessageType = MessageType.TEXT
     direction: MessageDirection
@@ -34,12 +37,14 @@ class MessageInDB(MessageBase):
     chat_id: str
     is_ai_generated: bool = False
 
-class Message(MessageBase):
+class Message(MessageBase, FromDBMixin):
     id: str = Field(alias="_id")
     chat_id: str
     is_ai_generated: bool = False
 
 class ChatBase(BaseModel):
+    model_config = ConfigDict(extra="ignore", populate_by_name=True, frozen=True)
+
     customer_phone: str
     customer_name: Optional[str] = None
     status: ChatStatus = ChatStatus.ACTIVE
@@ -53,6 +58,8 @@ class ChatCreate(ChatBase):
     phone_number: str
 
 class ChatUpdate(BaseModel):
+    model_config = ConfigDict(extra="ignore", populate_by_name=True, frozen=True)
+
     customer_name: Optional[str] = None
     status: Optional[ChatStatus] = None
     ai_enabled: Optional[bool] = None
@@ -68,7 +75,7 @@ class ChatInDB(ChatBase):
     updated_at: datetime
     last_message_at: Optional[datetime] = None
 
-class Chat(ChatBase):
+class Chat(ChatBase, FromDBMixin):
     id: str = Field(alias="_id")
     workspace_id: str
     phone_number: str
@@ -78,6 +85,8 @@ class Chat(ChatBase):
     messages: List[Message] = []
 
 class ChatSummary(BaseModel):
+    model_config = ConfigDict(extra="ignore", populate_by_name=True, frozen=True)
+
     chat_id: str
     customer_phone: str
     customer_name: Optional[str]
@@ -1,7 +1,18 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, PlainSerializer
 from typing import Optional, List, Dict, Any
+from typing_extensions import Annotated
 from datetime import datetime
 from enum import Enum
+from app.utils.embedding_helpers import coerce_embedding, embedding_to_list
+from app.models.base import FromDBMixin
+
+# Packed little-endian float32 vector; legacy float lists are packed on load.
+# JSON output unpacks it back to a float array, as the API has always returned.
+Embedding = Annotated[
+    bytes,
+    BeforeValidator(coerce_embedding),
+    PlainSerializer(embedding_to_list, return_type=List[float], when_used="json")
+]
 
 class DocumentType(str, Enum):
     PDF = "pdf"
@@ -16,6 +27,8 @@ class DocumentStatus(str, Enum):
     ERROR = "error"
 
 class DocumentBase(BaseModel):
+    model_config = ConfigDict(extra="ignore", populate_by_name=True, frozen=True)
+
     title: str
     file_name: str
     document_type: DocumentType
@@ -24,7 +37,7 @@ class DocumentBase(BaseModel):
     status: DocumentStatus = DocumentStatus.PROCESSING
     tags: List[str] = []
     description: Optional[str] = None
-    embedding: Optional[List[float]] = None
+    embedding: Optional[Embedding] = None
     chunk_count: int = 0
     metadata: Dict[str, Any] = {}
 
@@ -32,6 +45,8 @@ class DocumentCreate(DocumentBase):
     workspace_id: str
 
 class DocumentUpdate(BaseModel):
+    model_config = ConfigDict(extra="ignore", populate_by_name=True, frozen=True)
+
     title: Optional[str] = None
     content: Optional[str] = None
     status: Optional[DocumentStatus] = None
@@ -47,7 +62,7 @@ class DocumentInDB(DocumentBase):
     last_accessed: Optional[datetime] = None
     access_count: int = 0
 
-class Document(DocumentBase):
+class Document(DocumentBase, FromDBMixin):
     id: str = Field(alias="_id")
     workspace_id: str
     created_at: datetime
@@ -57,16 +72,20 @@ class Document(DocumentBase):
     access_count: int = 0
 
 class DocumentChunk(BaseModel):
+    model_config = ConfigDict(extra="ignore", populate_by_name=True, frozen=True)
+
     id: str = Field(alias="_id")
     document_id: str
     workspace_id: str
     content: str
     chunk_index: int
-    embedding: List[float]
+    embedding: Embedding
     metadata: Dict[str, Any] = {}
     created_at: datetime
 
 class DocumentSearch(BaseModel):
+    model_config = ConfigDict(extra="ignore", populate_by_name=True, frozen=True)
+
     query: str
     workspace_id: str
     limit: int = 5
@@ -75,6 +94,8 @@ class DocumentSearch(BaseModel):
     tags: Optional[List[str]] = None
 
 class SearchResult(BaseModel):
+    model_config = ConfigDict(extra="ignore", populate_by_name=True)
+
     document: Document
     chunks: List[DocumentChunk]
     similarity_score: float
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -9,6 +9,8 @@ class EmailConfigStatus(str, Enum):
     ERROR = "error"
 
 class EmailConfigBase(BaseModel):
+    model_config = ConfigDict(extra="ignore", populate_by_name=True, frozen=True)
+
     workspace_id: str
     email_address: EmailStr
     status: EmailConfigStatus = EmailConfigStatus.ACTIVE
@@ -21,6 +23,8 @@ class EmailConfigCreate(EmailConfigBase):
     pass
 
 class EmailConfigUpdate(BaseModel):
+    model_config = ConfigDict(extra="ignore", populate_by_name=True, frozen=True)
+
     email_address: Optional[EmailStr] = None
     status: Optional[EmailConfigStatus] = None
     send_frequency_minutes: Optional[int] = None
@@ -45,6 +49,8 @@ class EmailConfig(EmailConfigBase):
     last_error: Optional[str] = None
 
 class EmailLogBase(BaseModel):
+    model_config = ConfigDict(extra="ignore", populate_by_name=True, frozen=True)
+
     workspace_id: str
     email_config_id: str
     recipient_email: str
@@ -67,6 +73,8 @@ class EmailLog(EmailLogBase):
     created_at: datetime
 
 class EmailTestRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", populate_by_name=True, frozen=True)
+
     workspace_id: str
     email_address: EmailStr
     test_message: Optional[str] = "This is a test email from WhatsApp Chat Notification System"
\ No newline at end of file
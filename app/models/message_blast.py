@@ -1,4 +1,5 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -65,6 +66,30 @@ class MessageBlast(MessageBlastBase):
     failed_count: int = 0
     delivered_count: int = 0
 
+class MessageBlastSummary(BaseModel):
+    """Fields the blast list and details views read; fetched with a matching projection"""
+    model_config = ConfigDict(extra="ignore", populate_by_name=True, frozen=True)
+    
+    id: str = Field(alias="_id")
+    title: str
+    message_content: str
+    status: BlastStatus = BlastStatus.DRAFT
+    batch_size: int = 5
+    batch_interval_minutes: int = 2
+    start_time: datetime
+    end_time: Optional[datetime] = None
+    target_count: int = 0
+    sent_count: int = 0
+    failed_count: int = 0
+    delivered_count: int = 0
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+# Mongo projection matching MessageBlastSummary (_id is always returned)
+MESSAGE_BLAST_SUMMARY_PROJECTION = {
+    name: 1 for name in MessageBlastSummary.model_fields if name != "id"
+}
+
 class BlastTargetBase(BaseModel):
     phone_number: str
     status: MessageStatus = MessageStatus.PENDING
@@ -88,7 +113,8 @@ class BlastTarget(BlastTargetBase):
     created_at: datetime
     updated_at: datetime
 
-class BlastProgress(BaseModel):
+@dataclass(slots=True)
+class BlastProgress:
     blast_id: str
     total_targets: int
     pending_count: int
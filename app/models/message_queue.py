@@ -1,4 +1,5 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -11,6 +12,8 @@ class MessageQueueStatus(str, Enum):
     RETRY = "retry"
 
 class MessageQueueItem(BaseModel):
+    model_config = ConfigDict(extra="ignore", populate_by_name=True, frozen=True)
+
     message_id: str
     phone_number: str
     from_phone: str
@@ -25,14 +28,16 @@ class MessageQueueItem(BaseModel):
     completed_at: Optional[datetime] = None
     next_retry_at: Optional[datetime] = None
 
-class QueueStats(BaseModel):
+@dataclass(slots=True)
+class QueueStats:
     queue_length: int
     status_counts: Dict[str, int]
     avg_processing_time: float
     messages_last_hour: int
     success_rate: float
 
-class SystemHealth(BaseModel):
+@dataclass(slots=True)
+class SystemHealth:
     system_status: str
     timestamp: str
     issues: List[str]
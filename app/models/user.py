@@ -1,15 +1,19 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
 from bson import ObjectId
+from app.models.base import FromDBMixin
+
+# Syntax-only email check, run by pydantic-core's regex engine (no email-validator/DNS work per request)
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
 
 class UserRole(str, Enum):
     ADMIN = "admin"
     MEMBER = "member"
 
 class UserBase(BaseModel):
-    email: EmailStr
+    email: str = Field(pattern=EMAIL_PATTERN)
     full_name: str
     role: UserRole = UserRole.MEMBER
     is_active: bool = True
@@ -23,19 +27,21 @@ class UserUpdate(BaseModel):
 
 class UserInDB(UserBase):
     id: str = Field(alias="_id")
+    is_admin: bool = False
     hashed_password: str
     created_at: datetime
     updated_at: datetime
     workspaces: List[str] = []
 
-class User(UserBase):
+class User(UserBase, FromDBMixin):
     id: str = Field(alias="_id")
+    is_admin: bool = False  # Global admin; set on the first registered user
     created_at: datetime
     updated_at: datetime
     workspaces: List[str] = []
 
 class UserLogin(BaseModel):
-    email: EmailStr
+    email: str = Field(pattern=EMAIL_PATTERN)
     password: str
 
 class Token(BaseModel):
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
 class WorkflowStepType(str, Enum):
@@ -57,7 +57,7 @@ class ChatWorkflowProgress(BaseModel):
     is_qualified: bool = False
     needs_human_help: bool = False
     qualification_score: float = 0.0
-    last_updated: datetime = Field(default_factory=datetime.utcnow)
+    last_updated: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class WorkflowAnalysis(BaseModel):
     step_completed: bool
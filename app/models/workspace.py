@@ -1,21 +1,62 @@
-from pydantic import BaseModel, Field,EmailStr
-from typing import Optional, List, Dict
+from pydantic import BaseModel, BeforeValidator, Field, PlainSerializer,EmailStr
+from typing import Any, Optional, List, Dict, Type
+from typing_extensions import Annotated
 from datetime import datetime
-from enum import Enum
+from enum import Enum, IntEnum
 from app.auth.auth_handler import get_current_user  # Adjust import as per your project
 
 class WorkspaceStatus(str, Enum):
     ACTIVE = "active"
     INACTIVE = "inactive"
 
+# AI style tunables are stored as small ints; the API and prompt builder use the lowercase names
+class Tone(IntEnum):
+    POLITE = 0
+    FRIENDLY = 1
+    PROFESSIONAL = 2
+    CASUAL = 3
+
+class ResponseLength(IntEnum):
+    SHORT = 0
+    MEDIUM = 1
+    LONG = 2
+
+class Language(IntEnum):
+    ENGLISH = 0
+    SPANISH = 1
+    FRENCH = 2
+    GERMAN = 3
+    HINDI = 4
+    PORTUGUESE = 5
+    ITALIAN = 6
+
+def _coded(enum_cls: Type[IntEnum]):
+    """Field type accepting a code or a name, serialized to JSON as the lowercase name"""
+    def parse(value: Any) -> IntEnum:
+        if isinstance(value, str):
+            try:
+                return enum_cls[value.strip().upper()]
+            except KeyError:
+                raise ValueError(f"must be one of {', '.join(member.name.lower() for member in enum_cls)}")
+        return enum_cls(value)
+    return Annotated[
+        enum_cls,
+        BeforeValidator(parse),
+        PlainSerializer(lambda member: member.name.lower(), return_type=str, when_used="json"),
+    ]
+
+ToneCode = _coded(Tone)
+ResponseLengthCode = _coded(ResponseLength)
+LanguageCode = _coded(Language)
+
 class AISettings(BaseModel):
     # Basic AI Configuration
     system_prompt: str = "You are a helpful WhatsApp AI assistant for customer support."
     
     # Style and Tone Settings
-    tone: str = "polite"  # polite, friendly, professional, casual
-    response_length: str = "short"  # short, medium, long
-    language: str = "english"  # english, spanish, french, german, hindi, etc.
+    tone: ToneCode = Tone.POLITE
+    response_length: ResponseLengthCode = ResponseLength.SHORT
+    language: LanguageCode = Language.ENGLISH
     
     # Additional Options
     include_emojis: bool = True
@@ -76,6 +117,8 @@ class WorkspaceInDB(WorkspaceBase):
     updated_at: datetime
 
 class Workspace(WorkspaceBase):
+    # Only filled in when a single workspace is loaded; lists leave it out
+    ai_settings: Optional[AISettings] = None
     id: str = Field(alias="_id")
     admin_id: str
     member_ids: List[str] = []
@@ -1,26 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
 from app.models.user import User, UserCreate, UserLogin, Token
 from app.auth.auth_handler import (
     authenticate_user,
     create_access_token,
-    get_password_hash,
-    get_current_active_user
+    get_password_hash_async,
+    get_current_user
 )
 from app.database import get_database
 from app.config import settings
+from app.utils.request_helpers import json_body_openapi, parse_json_body
 from bson import ObjectId
-from datetime import datetime
+from datetime import datetime, timezone
+import asyncio
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.post("/register", response_model=User)
-async def register(user: UserCreate):
+# Pre-encoded body for logout; a fresh Response is built per request since middleware adds headers to it
+_LOGOUT_BODY = orjson.dumps({"message": "Successfully logged out"})
+
+@router.post("/register", response_model=User, openapi_extra=json_body_openapi(UserCreate))
+async def register(request: Request):
     """Register new user"""
+    user = await parse_json_body(request, UserCreate)
     db = get_database()
     
     # Validate input
@@ -42,8 +50,11 @@ async def register(user: UserCreate):
             detail="Full name must be at least 2 characters"
         )
     
-    # Check if user already exists
-    existing_user = await db.users.find_one({"email": user.email.lower().strip()})
+    # Check if user already exists and whether an admin exists, in one round trip
+    existing_user, existing_admin = await asyncio.gather(
+        db.users.find_one({"email": user.email.lower().strip()}, {"_id": 1}),
+        db.users.find_one({"is_admin": True}, {"_id": 1})
+    )
     if existing_user:
         raise HTTPException(
             status_code=400,
@@ -51,26 +62,22 @@ async def register(user: UserCreate):
         )
     
     # Create new user
-    user_dict = user.dict()
+    user_dict = user.model_dump()
     user_dict["email"] = user.email.lower().strip()
     user_dict["full_name"] = user.full_name.strip()
-    user_dict["hashed_password"] = get_password_hash(user.password)
+    user_dict["hashed_password"] = await get_password_hash_async(user.password)
     del user_dict["password"]
-    user_dict["created_at"] = datetime.utcnow()
-    user_dict["updated_at"] = datetime.utcnow()
+    now = datetime.now(timezone.utc)
+    user_dict["created_at"] = user_dict["updated_at"] = now
     user_dict["workspaces"] = []
 
     # ✅ Auto-make first registered user an admin
-    existing_admins = await db.users.count_documents({"is_admin": True})
-    if existing_admins == 0:
-        user_dict["is_admin"] = True
-    else:
-        user_dict["is_admin"] = False
+    user_dict["is_admin"] = existing_admin is None
 
     result = await db.users.insert_one(user_dict)
     user_dict["_id"] = str(result.inserted_id)
     
-    return User(**user_dict)
+    return User.from_db(user_dict)
 
 @router.post("/login", response_model=Token)
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
@@ -91,21 +98,21 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=User)
-async def get_current_user_info(current_user: User = Depends(get_current_active_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Get current user information"""
     return current_user
 
 @router.get("/check-admin/{workspace_id}")
 async def check_admin_access(
     workspace_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Check if user is admin of workspace"""
     from app.auth.auth_handler import verify_workspace_admin
     is_admin = await verify_workspace_admin(current_user, workspace_id)
-    return {"is_admin": is_admin, "user_id": current_user.id}
+    return ORJSONResponse({"is_admin": is_admin, "user_id": current_user.id})
 
 @router.post("/logout")
 async def logout():
     """Logout user (client should remove token)"""
-    return {"message": "Successfully logged out"}
+    return Response(content=_LOGOUT_BODY, media_type="application/json")
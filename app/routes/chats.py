@@ -1,21 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
 from typing import List
 from app.models.user import User
 from app.models.chat import Chat, ChatCreate, ChatUpdate, Message, MessageCreate, ChatSummary
-from app.auth.auth_handler import get_current_active_user, verify_workspace_access
+from app.auth.auth_handler import get_current_user, verify_workspace_access
 from app.services.chat_service import chat_service
 from app.database import get_database
+from app.utils.request_helpers import json_body_openapi, parse_json_body
 from bson import ObjectId
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-@router.get("/workspace/{workspace_id}", response_model=List[Chat])
+@router.get("/workspace/{workspace_id}", responses={200: {"model": List[Chat]}})
 async def get_workspace_chats(
     workspace_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get all chats for a workspace"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -24,12 +26,13 @@ async def get_workspace_chats(
             detail="Access denied to workspace"
         )
     
-    return await chat_service.get_workspace_chats(workspace_id)
+    chats = await chat_service.get_workspace_chats(workspace_id)
+    return ORJSONResponse([chat.model_dump(mode="json", by_alias=True) for chat in chats])
 
 @router.get("/{chat_id}", response_model=Chat)
 async def get_chat(
     chat_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get chat by ID"""
     chat = await chat_service.get_chat_by_id(chat_id)
@@ -51,7 +54,7 @@ async def get_chat(
 @router.post("/", response_model=Chat)
 async def create_chat(
     chat: ChatCreate,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Create new chat"""
     if not await verify_workspace_access(current_user, chat.workspace_id):
@@ -66,7 +69,7 @@ async def create_chat(
 async def update_chat(
     chat_id: str,
     chat_update: ChatUpdate,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Update chat"""
     chat = await chat_service.get_chat_by_id(chat_id)
@@ -91,13 +94,14 @@ async def update_chat(
     
     return updated_chat
 
-@router.post("/{chat_id}/messages", response_model=Message)
+@router.post("/{chat_id}/messages", response_model=Message, openapi_extra=json_body_openapi(MessageCreate))
 async def send_message(
     chat_id: str,
-    message_data: MessageCreate,
-    current_user: User = Depends(get_current_active_user)
+    request: Request,
+    current_user: User = Depends(get_current_user)
 ):
     """Send message to chat"""
+    message_data = await parse_json_body(request, MessageCreate)
     chat = await chat_service.get_chat_by_id(chat_id)
     if not chat:
         raise HTTPException(
@@ -117,7 +121,7 @@ async def send_message(
 async def update_chat_status(
     chat_id: str,
     status: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Update chat status"""
     chat = await chat_service.get_chat_by_id(chat_id)
@@ -136,10 +140,10 @@ async def update_chat_status(
     chat_update = ChatUpdate(status=status)
     return await chat_service.update_chat(chat_id, chat_update)
 
-@router.get("/qualified-leads/{workspace_id}", response_model=List[ChatSummary])
+@router.get("/qualified-leads/{workspace_id}", responses={200: {"model": List[ChatSummary]}})
 async def get_qualified_leads(
     workspace_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get qualified leads for workspace"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -148,12 +152,13 @@ async def get_qualified_leads(
             detail="Access denied to workspace"
         )
     
-    return await chat_service.get_qualified_leads(workspace_id)
+    leads = await chat_service.get_qualified_leads(workspace_id)
+    return ORJSONResponse([lead.model_dump(mode="json", by_alias=True) for lead in leads])
 
 @router.post("/{chat_id}/summary")
 async def generate_chat_summary(
     chat_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Generate summary for chat"""
     chat = await chat_service.get_chat_by_id(chat_id)
@@ -1,60 +1,75 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status, UploadFile, File, Form, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import List, Optional
 from app.models.user import User
 from app.models.document import Document, DocumentSearch, SearchResult, DocumentUpdate
-from app.auth.auth_handler import get_current_active_user, verify_workspace_access
+from app.auth.auth_handler import get_current_user, verify_workspace_access
 from app.services.document_service import document_service
+from app.utils.request_helpers import json_body_openapi, parse_json_body, parse_object_id
+from app.utils.streaming_helpers import NDJSON_MEDIA_TYPE, ndjson_stream
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-@router.get("/workspace/{workspace_id}", response_model=List[Document])
+@router.get("/workspace/{workspace_id}", responses={200: {"model": List[Document]}})
 async def get_workspace_documents(
     workspace_id: str,
+    request: Request,
     document_type: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
-    limit: int = Query(50, le=100),
+    limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_active_user)
+    include_stats: bool = Query(False),
+    current_user: User = Depends(get_current_user)
 ):
-    """Get all documents for a workspace with filtering"""
+    """Get documents for a workspace; include_stats adds totals, Accept: application/x-ndjson streams rows"""
     if not await verify_workspace_access(current_user, workspace_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to workspace"
         )
     
-    documents = await document_service.get_workspace_documents(workspace_id)
-    
-    # Apply filters
-    if document_type:
-        documents = [doc for doc in documents if doc.document_type == document_type]
-    
-    if status:
-        documents = [doc for doc in documents if doc.status == status]
-    
-    if search:
-        search_lower = search.lower()
-        documents = [
-            doc for doc in documents 
-            if search_lower in doc.title.lower() or 
-               search_lower in doc.file_name.lower() or
-               search_lower in (doc.description or "").lower()
-        ]
-    
-    # Apply pagination
-    total = len(documents)
-    documents = documents[offset:offset + limit]
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        rows = document_service.iter_workspace_documents(
+            workspace_id,
+            document_type=document_type,
+            status=status,
+            search=search,
+            offset=offset,
+            limit=limit
+        )
+        return StreamingResponse(ndjson_stream(rows), media_type=NDJSON_MEDIA_TYPE)
+    
+    if include_stats:
+        page = await document_service.list_with_stats(
+            workspace_id,
+            document_type=document_type,
+            status=status,
+            search=search,
+            offset=offset,
+            limit=limit
+        )
+        page["items"] = [doc.model_dump(mode="json", by_alias=True) for doc in page["items"]]
+        return ORJSONResponse(page)
+    
+    documents = await document_service.get_workspace_documents(
+        workspace_id,
+        document_type=document_type,
+        status=status,
+        search=search,
+        offset=offset,
+        limit=limit
+    )
     
-    return documents
+    return ORJSONResponse([doc.model_dump(mode="json", by_alias=True) for doc in documents])
 
 @router.get("/workspace/{workspace_id}/stats")
 async def get_workspace_document_stats(
     workspace_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get document statistics for workspace"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -63,35 +78,33 @@ async def get_workspace_document_stats(
             detail="Access denied to workspace"
         )
     
-    return await document_service.get_document_stats(workspace_id)
+    return ORJSONResponse(await document_service.get_document_stats(workspace_id))
 
 @router.get("/{document_id}")
 async def get_document(
     document_id: str,
-    current_user: User = Depends(get_current_active_user)
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
 ):
     """Get document by ID"""
-    # First get the document to check workspace access
-    from app.database import get_database
-    from bson import ObjectId
+    document_oid = parse_object_id(document_id, "Invalid document ID")
+    result = await document_service.get_document_by_id(document_oid)
     
-    db = get_database()
-    doc_data = await db.documents.find_one({"_id": ObjectId(document_id)})
-    
-    if not doc_data:
+    if not result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Document not found"
         )
     
-    workspace_id = str(doc_data["workspace_id"])
+    document, workspace_id = result
     if not await verify_workspace_access(current_user, workspace_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to document"
         )
     
-    return await document_service.get_document_by_id(document_id, workspace_id)
+    background_tasks.add_task(document_service.record_document_access, document_oid)
+    return document
 
 @router.post("/upload", response_model=Document)
 async def upload_document(
@@ -100,7 +113,7 @@ async def upload_document(
     title: Optional[str] = Form(None),
     description: Optional[str] = Form(None),
     tags: Optional[str] = Form(None),  # Comma-separated tags
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Upload document to workspace (supports PDF, DOCX, TXT, XLSX, XLS)"""
     logger.info(f"Document upload request from user {current_user.id} for workspace {workspace_id}")
@@ -127,27 +140,23 @@ async def upload_document(
         tags=tag_list
     )
 
-@router.put("/{document_id}", response_model=Document)
+@router.put("/{document_id}", response_model=Document, openapi_extra=json_body_openapi(DocumentUpdate))
 async def update_document(
     document_id: str,
-    update_data: DocumentUpdate,
-    current_user: User = Depends(get_current_active_user)
+    request: Request,
+    current_user: User = Depends(get_current_user)
 ):
     """Update document metadata"""
-    # First get the document to check workspace access
-    from app.database import get_database
-    from bson import ObjectId
-    
-    db = get_database()
-    doc_data = await db.documents.find_one({"_id": ObjectId(document_id)})
+    update_data = await parse_json_body(request, DocumentUpdate)
+    document_oid = parse_object_id(document_id, "Invalid document ID")
+    workspace_id = await document_service.get_document_workspace_id(document_oid)
     
-    if not doc_data:
+    if not workspace_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Document not found"
         )
     
-    workspace_id = str(doc_data["workspace_id"])
     if not await verify_workspace_access(current_user, workspace_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -163,7 +172,7 @@ async def update_document(
     if update_data.tags is not None:
         update_dict["tags"] = update_data.tags
     
-    updated_doc = await document_service.update_document(document_id, workspace_id, update_dict)
+    updated_doc = await document_service.update_document(document_oid, workspace_id, update_dict)
     if not updated_doc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -175,30 +184,25 @@ async def update_document(
 @router.delete("/{document_id}")
 async def delete_document(
     document_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Delete document"""
-    # First get the document to check workspace access
-    from app.database import get_database
-    from bson import ObjectId
+    document_oid = parse_object_id(document_id, "Invalid document ID")
+    workspace_id = await document_service.get_document_workspace_id(document_oid)
     
-    db = get_database()
-    doc_data = await db.documents.find_one({"_id": ObjectId(document_id)})
-    
-    if not doc_data:
+    if not workspace_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Document not found"
         )
     
-    workspace_id = str(doc_data["workspace_id"])
     if not await verify_workspace_access(current_user, workspace_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to document"
         )
     
-    success = await document_service.delete_document(document_id, workspace_id)
+    success = await document_service.delete_document(document_oid, workspace_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -207,12 +211,13 @@ async def delete_document(
     
     return {"message": "Document deleted successfully"}
 
-@router.post("/search", response_model=List[SearchResult])
+@router.post("/search", response_model=List[SearchResult], openapi_extra=json_body_openapi(DocumentSearch))
 async def search_documents(
-    search_request: DocumentSearch,
-    current_user: User = Depends(get_current_active_user)
+    request: Request,
+    current_user: User = Depends(get_current_user)
 ):
     """Advanced vector search in documents"""
+    search_request = await parse_json_body(request, DocumentSearch)
     if not await verify_workspace_access(current_user, search_request.workspace_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -225,8 +230,8 @@ async def search_documents(
 async def get_search_suggestions(
     workspace_id: str,
     query: str = Query(..., min_length=2),
-    limit: int = Query(5, le=10),
-    current_user: User = Depends(get_current_active_user)
+    limit: int = Query(5, ge=1, le=10),
+    current_user: User = Depends(get_current_user)
 ):
     """Get search suggestions based on document content"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -235,40 +240,4 @@ async def get_search_suggestions(
             detail="Access denied to workspace"
         )
     
-    # Simple keyword-based suggestions from document titles and content
-    from app.database import get_database
-    from bson import ObjectId
-    
-    db = get_database()
-    
-    # Search in titles and descriptions
-    pipeline = [
-        {
-            "$match": {
-                "workspace_id": ObjectId(workspace_id),
-                "$or": [
-                    {"title": {"$regex": query, "$options": "i"}},
-                    {"description": {"$regex": query, "$options": "i"}},
-                    {"tags": {"$regex": query, "$options": "i"}}
-                ]
-            }
-        },
-        {
-            "$project": {
-                "title": 1,
-                "description": 1,
-                "tags": 1
-            }
-        },
-        {"$limit": limit}
-    ]
-    
-    suggestions = []
-    async for doc in db.documents.aggregate(pipeline):
-        suggestions.append({
-            "text": doc["title"],
-            "type": "document",
-            "document_id": str(doc["_id"])
-        })
-    
-    return suggestions
\ No newline at end of file
+    return await document_service.get_search_suggestions(workspace_id, query, limit)
@@ -1,25 +1,68 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import List, Optional
 from app.models.user import User
 from app.models.email_config import (
     EmailConfig, EmailConfigCreate, EmailConfigUpdate, 
     EmailLog, EmailTestRequest
 )
-from app.auth.auth_handler import get_current_active_user, verify_workspace_access, verify_workspace_admin
+from app.auth.auth_handler import get_current_user, verify_workspace_access, verify_workspace_admin
 from app.services.email_notification_service import email_notification_service
+from app.services.message_queue import message_queue
 from app.database import get_database
+from app.config import settings
+from app.utils.cache_helpers import AsyncTTLCache
+from app.utils.lock_helpers import acquire_lock, release_lock
+from app.utils.request_helpers import parse_object_id
+from app.utils.streaming_helpers import json_array_stream
 from bson import ObjectId
-from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Status and statistics are polled by dashboards; serve them up to 10s stale
+_status_cache = AsyncTTLCache(maxsize=1024, ttl=10)
+
+# Expiry for the manual-notification lock in case its holder dies mid-report
+MANUAL_NOTIFICATION_LOCK_SECONDS = 300
+
+async def _get_config_admin_scope(config_oid: ObjectId, user: User) -> Optional[dict]:
+    """Fetch a config's workspace_id and whether the user administers that workspace, in one query"""
+    db = get_database()
+    results = await db.email_configs.aggregate([
+        {"$match": {"_id": config_oid}},
+        {
+            "$lookup": {
+                "from": "workspaces",
+                "let": {"workspace_oid": {"$convert": {"input": "$workspace_id", "to": "objectId", "onError": None}}},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$_id", "$$workspace_oid"]}}},
+                    {"$project": {"_id": 0, "admin_id": 1}}
+                ],
+                "as": "workspace"
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "workspace_id": 1,
+                "is_admin": {"$in": [ObjectId(user.id), "$workspace.admin_id"]}
+            }
+        }
+    ]).to_list(1)
+    
+    return results[0] if results else None
 
 @router.get("/configs/workspace/{workspace_id}", response_model=List[EmailConfig])
 async def get_workspace_email_configs(
     workspace_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get email configurations for a workspace"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -29,19 +72,18 @@ async def get_workspace_email_configs(
         )
     
     db = get_database()
-    cursor = db.email_configs.find({"workspace_id": workspace_id})
-    configs = []
-    
-    async for config in cursor:
-        config["_id"] = str(config["_id"])
-        configs.append(EmailConfig(**config))
+    # _id is stringified server-side so no ObjectId is built per document
+    configs = await db.email_configs.aggregate([
+        {"$match": {"workspace_id": workspace_id}},
+        {"$addFields": {"_id": {"$toString": "$_id"}}}
+    ]).to_list(length=1000)
     
-    return configs
+    return [EmailConfig.model_validate(config) for config in configs]
 
 @router.post("/configs", response_model=EmailConfig)
 async def create_email_config(
     config_data: EmailConfigCreate,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Create new email configuration (admin only)"""
     if not await verify_workspace_admin(current_user, config_data.workspace_id):
@@ -52,17 +94,6 @@ async def create_email_config(
     
     db = get_database()
     
-    # Check if configuration already exists for this workspace
-    existing_config = await db.email_configs.find_one({
-        "workspace_id": config_data.workspace_id
-    })
-    
-    if existing_config:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email configuration already exists for this workspace. Use update instead."
-        )
-    
     # Validate email configuration
     if config_data.send_frequency_minutes < 1 or config_data.send_frequency_minutes > 60:
         raise HTTPException(
@@ -70,25 +101,34 @@ async def create_email_config(
             detail="Send frequency must be between 1 and 60 minutes"
         )
     
-    config_dict = config_data.dict()
-    config_dict["created_at"] = datetime.utcnow()
-    config_dict["updated_at"] = datetime.utcnow()
+    config_dict = config_data.model_dump()
+    now = datetime.now(timezone.utc)
+    config_dict["created_at"] = now
+    config_dict["updated_at"] = now
     config_dict["total_emails_sent"] = 0
     
-    result = await db.email_configs.insert_one(config_dict)
+    # The unique workspace_id index rejects a second configuration atomically
+    try:
+        result = await db.email_configs.insert_one(config_dict)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email configuration already exists for this workspace. Use update instead."
+        )
     config_dict["_id"] = str(result.inserted_id)
     
-    return EmailConfig(**config_dict)
+    return EmailConfig.model_validate(config_dict)
 
 @router.put("/configs/{config_id}", response_model=EmailConfig)
 async def update_email_config(
     config_id: str,
     update_data: EmailConfigUpdate,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Update email configuration (admin only)"""
+    config_oid = parse_object_id(config_id, "Invalid email configuration ID")
     db = get_database()
-    config = await db.email_configs.find_one({"_id": ObjectId(config_id)})
+    config = await _get_config_admin_scope(config_oid, current_user)
     
     if not config:
         raise HTTPException(
@@ -96,15 +136,14 @@ async def update_email_config(
             detail="Email configuration not found"
         )
     
-    workspace_id = str(config["workspace_id"])
-    if not await verify_workspace_admin(current_user, workspace_id):
+    if not config["is_admin"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only workspace administrators can update email configurations"
         )
     
-    update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
-    update_dict["updated_at"] = datetime.utcnow()
+    update_dict = update_data.model_dump(exclude_unset=True, exclude_none=True)
+    update_dict["updated_at"] = datetime.now(timezone.utc)
     
     # Validate frequency if being updated
     if "send_frequency_minutes" in update_dict:
@@ -114,25 +153,31 @@ async def update_email_config(
                 detail="Send frequency must be between 1 and 60 minutes"
             )
     
-    await db.email_configs.update_one(
-        {"_id": ObjectId(config_id)},
-        {"$set": update_dict}
+    updated_config = await db.email_configs.find_one_and_update(
+        {"_id": config_oid},
+        {"$set": update_dict},
+        return_document=ReturnDocument.AFTER
     )
     
-    # Get updated config
-    updated_config = await db.email_configs.find_one({"_id": ObjectId(config_id)})
+    if not updated_config:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Email configuration not found"
+        )
+    
     updated_config["_id"] = str(updated_config["_id"])
     
-    return EmailConfig(**updated_config)
+    return EmailConfig.model_validate(updated_config)
 
 @router.delete("/configs/{config_id}")
 async def delete_email_config(
     config_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Delete email configuration (admin only)"""
+    config_oid = parse_object_id(config_id, "Invalid email configuration ID")
     db = get_database()
-    config = await db.email_configs.find_one({"_id": ObjectId(config_id)})
+    config = await _get_config_admin_scope(config_oid, current_user)
     
     if not config:
         raise HTTPException(
@@ -140,23 +185,24 @@ async def delete_email_config(
             detail="Email configuration not found"
         )
     
-    workspace_id = str(config["workspace_id"])
-    if not await verify_workspace_admin(current_user, workspace_id):
+    if not config["is_admin"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only workspace administrators can delete email configurations"
         )
     
-    # Delete configuration and related logs
-    await db.email_configs.delete_one({"_id": ObjectId(config_id)})
-    await db.email_logs.delete_many({"email_config_id": config_id})
+    # Delete configuration and related logs concurrently
+    await asyncio.gather(
+        db.email_configs.delete_one({"_id": config_oid}),
+        db.email_logs.delete_many({"email_config_id": config_id})
+    )
     
     return {"message": "Email configuration deleted successfully"}
 
 @router.post("/test")
 async def test_email_configuration(
     test_request: EmailTestRequest,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Test email configuration by sending a test email"""
     if not await verify_workspace_admin(current_user, test_request.workspace_id):
@@ -205,11 +251,11 @@ async def test_email_configuration(
             detail=f"Email test failed: {str(e)}"
         )
 
-@router.get("/logs/workspace/{workspace_id}", response_model=List[EmailLog])
+@router.get("/logs/workspace/{workspace_id}", responses={200: {"model": List[EmailLog]}})
 async def get_workspace_email_logs(
     workspace_id: str,
     limit: int = Query(20, description="Number of logs to return", ge=1, le=100),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get email logs for a workspace"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -219,20 +265,21 @@ async def get_workspace_email_logs(
         )
     
     db = get_database()
-    cursor = db.email_logs.find({"workspace_id": workspace_id}).sort("sent_at", -1).limit(limit)
-    
-    logs = []
-    async for log in cursor:
-        log["_id"] = str(log["_id"])
-        logs.append(EmailLog(**log))
+    cursor = db.email_logs.aggregate([
+        {"$match": {"workspace_id": workspace_id}},
+        {"$sort": {"sent_at": -1}},
+        {"$limit": limit},
+        {"$addFields": {"_id": {"$toString": "$_id"}}}
+    ])
     
-    return logs
+    # Read-only log view: stream stored documents straight to JSON, no model round-trip
+    return StreamingResponse(json_array_stream(cursor), media_type="application/json")
 
 @router.get("/statistics/workspace/{workspace_id}")
 async def get_email_statistics(
     workspace_id: str,
     days: int = Query(7, description="Number of days to include in statistics", ge=1, le=30),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get email notification statistics for a workspace"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -242,7 +289,10 @@ async def get_email_statistics(
         )
     
     try:
-        stats = await email_notification_service.get_email_statistics(workspace_id, days)
+        stats = await _status_cache.get_or_set(
+            ("email_statistics", workspace_id, days),
+            lambda: email_notification_service.get_email_statistics(workspace_id, days)
+        )
         return {
             "workspace_id": workspace_id,
             "statistics": stats,
@@ -260,7 +310,7 @@ async def get_email_statistics(
 async def trigger_manual_notification(
     workspace_id: str,
     hours: int = Query(1, description="Number of hours to include in report", ge=1, le=24),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Manually trigger email notification for a workspace"""
     if not await verify_workspace_admin(current_user, workspace_id):
@@ -288,8 +338,20 @@ async def trigger_manual_notification(
         original_last_sent = config.get("last_email_sent")
         config["last_email_sent"] = datetime.utcnow() - timedelta(hours=hours)
         
+        # One manual report per workspace at a time, across all workers
+        lock_key = f"lock:manual_notification:{workspace_id}"
+        lock_token = await acquire_lock(message_queue.redis_client, lock_key, MANUAL_NOTIFICATION_LOCK_SECONDS)
+        if lock_token is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A manual notification for this workspace is already running"
+            )
+        
         # Send notification
-        result = await email_notification_service._send_workspace_notification(config)
+        try:
+            result = await email_notification_service._send_workspace_notification(config)
+        finally:
+            await release_lock(message_queue.redis_client, lock_key, lock_token)
         
         return {
             "success": result["success"],
@@ -308,48 +370,64 @@ async def trigger_manual_notification(
             detail="Failed to trigger manual notification"
         )
 
+async def _load_notification_system_status() -> dict:
+    """Build the email notification system status from the database"""
+    db = get_database()
+    now = datetime.now(timezone.utc)
+    
+    # Get configuration counts (one pass) and recent activity concurrently
+    config_counts, recent_logs = await asyncio.gather(
+        db.email_configs.aggregate([
+            {
+                "$group": {
+                    "_id": None,
+                    "total": {"$sum": 1},
+                    "active": {"$sum": {"$cond": [{"$eq": ["$status", "active"]}, 1, 0]}}
+                }
+            }
+        ]).to_list(1),
+        db.email_logs.find(
+            {"sent_at": {"$gte": now - timedelta(hours=24)}},
+            projection={"_id": 0, "workspace_id": 1, "recipient_email": 1, "message_count": 1, "sent_at": 1, "status": 1}
+        ).sort("sent_at", -1).limit(10).to_list(None)
+    )
+    counts = config_counts[0] if config_counts else {}
+    total_configs = counts.get("total", 0)
+    active_configs = counts.get("active", 0)
+    
+    # SMTP configuration status
+    smtp_configured = all([
+        settings.smtp_server,
+        settings.smtp_port,
+        settings.smtp_username,
+        settings.smtp_password
+    ])
+    
+    return {
+        "system_status": "healthy" if smtp_configured else "configuration_incomplete",
+        "total_configurations": total_configs,
+        "active_configurations": active_configs,
+        "smtp_configured": smtp_configured,
+        "recent_activity": [
+            {
+                "workspace_id": log["workspace_id"],
+                "recipient": log["recipient_email"],
+                "message_count": log["message_count"],
+                "sent_at": log["sent_at"],
+                "status": log["status"]
+            }
+            for log in recent_logs
+        ],
+        "last_check": now
+    }
+
 @router.get("/system/status")
 async def get_notification_system_status(
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get status of email notification system"""
     try:
-        db = get_database()
-        
-        # Get total configurations
-        total_configs = await db.email_configs.count_documents({})
-        active_configs = await db.email_configs.count_documents({"status": "active"})
-        
-        # Get recent activity
-        recent_logs = await db.email_logs.find({
-            "sent_at": {"$gte": datetime.utcnow() - timedelta(hours=24)}
-        }).sort("sent_at", -1).limit(10).to_list(None)
-        
-        # SMTP configuration status
-        smtp_configured = all([
-            settings.smtp_server,
-            settings.smtp_port,
-            settings.smtp_username,
-            settings.smtp_password
-        ])
-        
-        return {
-            "system_status": "healthy" if smtp_configured else "configuration_incomplete",
-            "total_configurations": total_configs,
-            "active_configurations": active_configs,
-            "smtp_configured": smtp_configured,
-            "recent_activity": [
-                {
-                    "workspace_id": log["workspace_id"],
-                    "recipient": log["recipient_email"],
-                    "message_count": log["message_count"],
-                    "sent_at": log["sent_at"].isoformat(),
-                    "status": log["status"]
-                }
-                for log in recent_logs
-            ],
-            "last_check": datetime.utcnow().isoformat()
-        }
+        return ORJSONResponse(await _status_cache.get_or_set("system_status", _load_notification_system_status))
         
     except Exception as e:
         logger.error(f"Failed to get system status: {e}")
@@ -1,22 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from typing import Optional
 from datetime import datetime, timedelta
+from email.mime.text import MIMEText
 from app.models.user import User
-from app.auth.auth_handler import get_current_active_user, verify_workspace_access, verify_workspace_admin
+from app.auth.auth_handler import get_current_user, verify_workspace_access, verify_workspace_admin
 from app.services.excel_export_service import excel_export_service
 from app.services.export_scheduler import export_scheduler
+from app.services.email_notification_service import email_notification_service
+from app.config import settings
+from app.services.message_queue import message_queue
+from app.utils.cache_helpers import AsyncTTLCache
+from app.utils.lock_helpers import acquire_lock, release_lock
+import asyncio
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Scheduler status is polled by dashboards; serve it up to 10s stale
+_status_cache = AsyncTTLCache(maxsize=4, ttl=10)
+
+# trigger-now lock; expires on its own if the export dies before releasing it
+_EXPORT_ALL_LOCK_KEY = "lock:export_all_workspaces"
+EXPORT_ALL_LOCK_SECONDS = 1800
+
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+async def _send_test_email(test_email: str, workspace_id: str):
+    """Send the export-service test email; runs after the response has been sent"""
+    try:
+        msg = MIMEText("This is a test email from WhatsApp AI Automation System Excel Export Service.")
+        msg['Subject'] = f"Test Email - WhatsApp Export System"
+        msg['From'] = settings.smtp_username
+        msg['To'] = test_email
+        
+        await email_notification_service._send_smtp_email(msg)
+        
+        logger.info(f"Test email sent to {test_email} for workspace {workspace_id}")
+    except Exception as e:
+        logger.error(f"Email test failed for workspace {workspace_id}: {e}")
 
 @router.post("/manual/{workspace_id}")
 async def generate_manual_export(
     workspace_id: str,
     email: str = Query(..., description="Email address to send the export"),
     hours: int = Query(24, description="Number of hours to include in export", ge=1, le=168),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Generate manual Excel export for a workspace"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -27,9 +59,7 @@ async def generate_manual_export(
     
     try:
         # Validate email format
-        import re
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email):
+        if not _EMAIL_RE.match(email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid email format"
@@ -47,7 +77,7 @@ async def generate_manual_export(
             "message": f"Export generated and sent to {email}",
             "workspace_id": workspace_id,
             "hours_included": hours,
-            "generated_at": datetime.utcnow().isoformat()
+            "generated_at": datetime.utcnow()
         }
         
     except Exception as e:
@@ -61,7 +91,7 @@ async def generate_manual_export(
 async def get_export_statistics(
     workspace_id: str,
     days: int = Query(7, description="Number of days to include in statistics", ge=1, le=30),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get export statistics for a workspace"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -85,18 +115,22 @@ async def get_export_statistics(
             detail="Failed to retrieve export statistics"
         )
 
+async def _load_scheduler_status() -> dict:
+    """Read the export scheduler's job status"""
+    return export_scheduler.get_scheduler_status()
+
 @router.get("/scheduler/status")
 async def get_export_scheduler_status(
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get status of export scheduler"""
     try:
-        status = export_scheduler.get_scheduler_status()
+        sched_status = await _status_cache.get_or_set("scheduler_status", _load_scheduler_status)
         return {
-            "scheduler_status": status,
-            "export_frequency": f"Every {status.get('export_interval', 15)} minutes",
+            "scheduler_status": sched_status,
+            "export_frequency": f"Every {sched_status.get('export_interval', 15)} minutes",
             "next_exports": [
-                job for job in status.get("jobs", []) 
+                job for job in sched_status.get("jobs", []) 
                 if job.get("id") == "whatsapp_export"
             ]
         }
@@ -108,13 +142,14 @@ async def get_export_scheduler_status(
             detail="Failed to get scheduler status"
         )
 
-@router.post("/test-email")
+@router.post("/test-email", status_code=status.HTTP_202_ACCEPTED)
 async def test_email_configuration(
     workspace_id: str,
+    background_tasks: BackgroundTasks,
     test_email: str = Query(..., description="Email address to test"),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
-    """Test email configuration for a workspace"""
+    """Queue a test email for a workspace; the SMTP send happens after the response"""
     if not await verify_workspace_admin(current_user, workspace_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -123,36 +158,23 @@ async def test_email_configuration(
     
     try:
         # Validate email format
-        import re
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, test_email):
+        if not _EMAIL_RE.match(test_email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid email format"
             )
         
-        # Send test email
-        import smtplib
-        from email.mime.text import MIMEText
-        from app.config import settings
-        
-        msg = MIMEText("This is a test email from WhatsApp AI Automation System Excel Export Service.")
-        msg['Subject'] = f"Test Email - WhatsApp Export System"
-        msg['From'] = settings.smtp_username
-        msg['To'] = test_email
-        
-        server = smtplib.SMTP(settings.smtp_server, settings.smtp_port)
-        server.starttls()
-        server.login(settings.smtp_username, settings.smtp_password)
-        server.send_message(msg)
-        server.quit()
+        background_tasks.add_task(_send_test_email, test_email, workspace_id)
         
         return {
             "success": True,
-            "message": f"Test email sent successfully to {test_email}",
+            "queued": True,
+            "message": f"Test email queued for {test_email}",
             "workspace_id": workspace_id
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Email test failed: {e}")
         raise HTTPException(
@@ -164,7 +186,7 @@ async def test_email_configuration(
 async def get_export_logs(
     workspace_id: str,
     limit: int = Query(20, description="Number of logs to return", ge=1, le=100),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get export logs for a workspace"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -177,35 +199,24 @@ async def get_export_logs(
         from app.database import get_database
         db = get_database()
         
-        # Get export logs
-        export_logs = await db.export_logs.find({
-            "workspace_id": workspace_id
-        }).sort("export_timestamp", -1).limit(limit).to_list(None)
-        
-        # Get system logs related to exports
-        system_logs = await db.system_logs.find({
-            "service": "excel_export_scheduler"
-        }).sort("timestamp", -1).limit(limit).to_list(None)
+        # Get export logs and the system logs related to exports concurrently
+        export_logs, system_logs = await asyncio.gather(
+            db.export_logs.find(
+                {"workspace_id": workspace_id},
+                projection={"_id": 0, "export_timestamp": 1, "export_type": 1, "created_at": 1}
+            ).sort("export_timestamp", -1).limit(limit).to_list(None),
+            db.system_logs.find(
+                {"service": "excel_export_scheduler"},
+                projection={"_id": 0, "event_type": 1, "message": 1, "timestamp": 1}
+            ).sort("timestamp", -1).limit(limit).to_list(None)
+        )
         
-        return {
+        # Projected documents already have the response shape; orjson encodes their datetimes
+        return ORJSONResponse({
             "workspace_id": workspace_id,
-            "export_logs": [
-                {
-                    "export_timestamp": log["export_timestamp"].isoformat(),
-                    "export_type": log["export_type"],
-                    "created_at": log["created_at"].isoformat()
-                }
-                for log in export_logs
-            ],
-            "system_logs": [
-                {
-                    "event_type": log["event_type"],
-                    "message": log["message"],
-                    "timestamp": log["timestamp"].isoformat()
-                }
-                for log in system_logs
-            ]
-        }
+            "export_logs": export_logs,
+            "system_logs": system_logs
+        })
         
     except Exception as e:
         logger.error(f"Failed to get export logs: {e}")
@@ -214,11 +225,21 @@ async def get_export_logs(
             detail="Failed to retrieve export logs"
         )
 
-@router.post("/trigger-now")
+async def _run_export_all(lock_token: str):
+    """Export every workspace, then release the trigger-now lock"""
+    try:
+        await excel_export_service.export_all_workspace_messages()
+    except Exception as e:
+        logger.error(f"Manual export for all workspaces failed: {e}")
+    finally:
+        await release_lock(message_queue.redis_client, _EXPORT_ALL_LOCK_KEY, lock_token)
+
+@router.post("/trigger-now", status_code=status.HTTP_202_ACCEPTED)
 async def trigger_export_now(
-    current_user: User = Depends(get_current_active_user)
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
 ):
-    """Manually trigger export for all workspaces (admin only)"""
+    """Manually trigger export for all workspaces (admin only); the export runs after the response"""
     try:
         # Only allow global admins to trigger system-wide export
         if not current_user.is_admin:
@@ -227,16 +248,26 @@ async def trigger_export_now(
                 detail="Only system administrators can trigger system-wide exports"
             )
         
-        # Trigger the export job
-        await excel_export_service.export_all_workspace_messages()
+        # Only one system-wide export at a time, across all workers
+        lock_token = await acquire_lock(message_queue.redis_client, _EXPORT_ALL_LOCK_KEY, EXPORT_ALL_LOCK_SECONDS)
+        if lock_token is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="An export for all workspaces is already running"
+            )
+        
+        background_tasks.add_task(_run_export_all, lock_token)
         
         return {
             "success": True,
+            "queued": True,
             "message": "Export triggered successfully for all workspaces",
-            "triggered_at": datetime.utcnow().isoformat(),
+            "triggered_at": datetime.utcnow(),
             "triggered_by": current_user.email
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to trigger manual export: {e}")
         raise HTTPException(
@@ -1,26 +1,151 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Form, Query
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
 from app.models.user import User
 from app.models.message_blast import (
     MessageBlast, MessageBlastCreate, MessageBlastUpdate, BlastProgress, 
-    BlastTarget, BlastStatus, MessageStatus
+    BlastTarget, BlastStatus, MessageStatus, MessageBlastSummary
 )
-from app.auth.auth_handler import get_current_active_user, verify_workspace_access, verify_workspace_admin
+from app.auth.auth_handler import (
+    get_current_user, verify_workspace_access, verify_workspace_admin, get_user_role_in_workspace
+)
+from app.config import settings
+from app.database import get_database
 from app.services.message_blast_service import message_blast_service
 from app.services.blast_scheduler_service import blast_scheduler_service
-from datetime import datetime
+from app.services.message_queue import message_queue
+from app.utils.cache_helpers import redis_get_or_set, redis_invalidate
+from app.utils.request_helpers import parse_object_id
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from bson.errors import InvalidId
+import dataclasses
 import logging
-import tempfile
+import aiofiles.os
+import aiofiles.tempfile
 import os
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Shared dependency marker so every route reuses one Depends instance
+CURRENT_USER = Depends(get_current_user)
+
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Polled by the UI every few seconds; mutations below invalidate explicitly
+BLAST_PROGRESS_CACHE_SECONDS = 2
+WORKSPACE_BLASTS_CACHE_SECONDS = 5
+
+# .xlsx is a zip archive; .xls is an OLE2 compound document
+EXCEL_MAGIC = {
+    ".xlsx": b"PK\x03\x04",
+    ".xls": b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",
+}
+
+async def _spool_upload(file: UploadFile) -> str:
+    """Check an upload's magic bytes, then copy it to a temp file in fixed-size chunks and return its path"""
+    suffix = os.path.splitext(file.filename or "")[1].lower()
+    head = await file.read(8)
+    magic = EXCEL_MAGIC.get(suffix)
+    if magic is None or not head.startswith(magic):
+        raise HTTPException(
+            status_code=400,
+            detail="File content is not a valid Excel file (.xlsx or .xls)"
+        )
+    
+    async with aiofiles.tempfile.NamedTemporaryFile(
+        delete=False, suffix=suffix, dir=settings.blast_tmpdir
+    ) as temp_file:
+        await temp_file.write(head)
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await temp_file.write(chunk)
+        return temp_file.name
+
+async def _discard_upload(temp_file_path: str):
+    """Remove a spooled upload without blocking the event loop"""
+    try:
+        await aiofiles.os.remove(temp_file_path)
+    except FileNotFoundError:
+        pass
+
+def _parse_utc_datetime(value: str) -> datetime:
+    """Parse a client ISO timestamp (Z suffix allowed) as aware UTC; naive values are taken as UTC"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid datetime: {value}")
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+def _progress_cache_key(blast_id: str) -> str:
+    """Redis key for a blast's cached progress"""
+    return f"blast:{blast_id}:progress"
+
+def _workspace_blasts_cache_key(workspace_id: str) -> str:
+    """Redis key for a workspace's cached blast list"""
+    return f"blasts:workspace:{workspace_id}"
 
-@router.get("/workspace/{workspace_id}", response_model=List[MessageBlast])
+async def _invalidate_blast_cache(blast_id: Optional[str], workspace_id: str):
+    """Drop cached progress for a blast and the cached blast list of its workspace"""
+    keys = [_workspace_blasts_cache_key(workspace_id)]
+    if blast_id:
+        keys.append(_progress_cache_key(blast_id))
+    await redis_invalidate(message_queue.redis_client, *keys)
+
+async def _start_blast_in_background(blast_id: str, workspace_id: str):
+    """Start a blast after the response is sent, log the outcome and always refresh its cache"""
+    try:
+        if await message_blast_service.start_blast(blast_id):
+            logger.info(f"Queued start of blast {blast_id} succeeded")
+        else:
+            logger.warning(f"Queued start of blast {blast_id} skipped: it is no longer scheduled")
+    except Exception as e:
+        logger.error(f"Queued start of blast {blast_id} failed: {e}")
+    finally:
+        await _invalidate_blast_cache(blast_id, workspace_id)
+
+# Just enough of a blast to authorize it and check its status
+BLAST_ACCESS_PROJECTION = {"workspace_id": 1, "status": 1}
+
+def require_blast_access(admin: bool = False, action: Optional[str] = None, full: bool = False):
+    """Build a dependency that loads the path's blast in one query and checks the user's (cached) role"""
+    detail = f"Only workspace administrators can {action} message blasts" if admin else "Access denied to blast"
+    projection = None if full else BLAST_ACCESS_PROJECTION
+    
+    async def authorized_blast(blast_id: str, current_user: User = CURRENT_USER) -> dict:
+        try:
+            blast_oid = ObjectId(blast_id)
+        except (InvalidId, TypeError):
+            blast_oid = None
+        
+        db = get_database()
+        blast_data = await db.message_blasts.find_one({"_id": blast_oid}, projection) if blast_oid else None
+        if not blast_data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Message blast not found"
+            )
+        
+        blast_data["_id"] = blast_id
+        blast_data["workspace_id"] = str(blast_data["workspace_id"])
+        role = await get_user_role_in_workspace(current_user, blast_data["workspace_id"])
+        if role == "none" or (admin and role != "admin"):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=detail
+            )
+        
+        return blast_data
+    
+    return authorized_blast
+
+@router.get("/workspace/{workspace_id}", response_model=List[MessageBlastSummary])
 async def get_workspace_blasts(
     workspace_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = CURRENT_USER
 ):
     """Get all message blasts for a workspace"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -29,10 +154,18 @@ async def get_workspace_blasts(
             detail="Access denied to workspace"
         )
     
-    return await message_blast_service.get_workspace_blasts(workspace_id)
+    async def load_blasts():
+        blasts = await message_blast_service.get_workspace_blasts(workspace_id)
+        return [blast.model_dump(mode="json", by_alias=True) for blast in blasts]
+    
+    return await redis_get_or_set(
+        message_queue.redis_client, _workspace_blasts_cache_key(workspace_id),
+        WORKSPACE_BLASTS_CACHE_SECONDS, load_blasts
+    )
 
 @router.post("/", response_model=MessageBlast)
 async def create_blast(
+    background_tasks: BackgroundTasks,
     workspace_id: str = Form(...),
     title: str = Form(...),
     message_content: str = Form(...),
@@ -42,7 +175,7 @@ async def create_blast(
     start_time: str = Form(...),  # ISO format datetime string
     end_time: Optional[str] = Form(None),
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = CURRENT_USER
 ):
     """Create new message blast with Excel upload"""
     # Only workspace admins can create blasts
@@ -61,10 +194,7 @@ async def create_blast(
             )
         
         # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        temp_file_path = await _spool_upload(file)
         
         try:
             # Extract phone numbers from Excel
@@ -79,12 +209,11 @@ async def create_blast(
                 )
             
             # Parse datetime strings
-            start_datetime = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-            end_datetime = None
-            if end_time:
-                end_datetime = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+            start_datetime = _parse_utc_datetime(start_time)
+            end_datetime = _parse_utc_datetime(end_time) if end_time else None
+            now = datetime.now(timezone.utc)
             
-            # Create blast
+            # Create blast already scheduled; start_blast only accepts scheduled blasts
             blast_create = MessageBlastCreate(
                 workspace_id=workspace_id,
                 title=title.strip(),
@@ -94,32 +223,25 @@ async def create_blast(
                 batch_interval_minutes=max(1, min(30, batch_interval_minutes)),
                 start_time=start_datetime,
                 end_time=end_datetime,
+                status=BlastStatus.SCHEDULED,
                 phone_numbers=phone_numbers
             )
             
             blast = await message_blast_service.create_blast(blast_create, current_user.id)
+            await _invalidate_blast_cache(None, workspace_id)
             
             # Schedule the blast if start time is in the future
-            if start_datetime > datetime.utcnow():
-                await blast_scheduler_service.schedule_blast(blast.id, start_datetime)
-                
-                # Update status to scheduled
-                from app.database import get_database
-                db = get_database()
-                await db.message_blasts.update_one(
-                    {"_id": ObjectId(blast.id)},
-                    {"$set": {"status": BlastStatus.SCHEDULED}}
-                )
+            if start_datetime > now:
+                background_tasks.add_task(blast_scheduler_service.schedule_blast, blast.id, start_datetime)
             else:
-                # Start immediately
-                await message_blast_service.start_blast(blast.id)
+                # Start immediately, after the response is sent
+                background_tasks.add_task(_start_blast_in_background, blast.id, workspace_id)
             
             return blast
             
         finally:
             # Cleanup temp file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+            await _discard_upload(temp_file_path)
     
     except HTTPException:
         raise
@@ -131,46 +253,17 @@ async def create_blast(
         )
 
 @router.get("/{blast_id}", response_model=MessageBlast)
-async def get_blast(
-    blast_id: str,
-    current_user: User = Depends(get_current_active_user)
-):
+async def get_blast(blast_data: dict = Depends(require_blast_access(full=True))):
     """Get message blast by ID"""
-    blast = await message_blast_service.get_blast_by_id(blast_id)
-    if not blast:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Message blast not found"
-        )
-    
-    if not await verify_workspace_access(current_user, blast.workspace_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied to blast"
-        )
-    
-    return blast
+    return MessageBlast(**blast_data)
 
 @router.put("/{blast_id}", response_model=MessageBlast)
 async def update_blast(
     blast_id: str,
     update_data: MessageBlastUpdate,
-    current_user: User = Depends(get_current_active_user)
+    blast_data: dict = Depends(require_blast_access(admin=True, action="update"))
 ):
     """Update message blast (only draft/scheduled blasts)"""
-    blast = await message_blast_service.get_blast_by_id(blast_id)
-    if not blast:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Message blast not found"
-        )
-    
-    if not await verify_workspace_admin(current_user, blast.workspace_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only workspace administrators can update message blasts"
-        )
-    
     try:
         updated_blast = await message_blast_service.update_blast(blast_id, update_data)
         if not updated_blast:
@@ -179,6 +272,7 @@ async def update_blast(
                 detail="Cannot update blast in current status"
             )
         
+        await _invalidate_blast_cache(blast_id, blast_data["workspace_id"])
         return updated_blast
         
     except ValueError as e:
@@ -187,22 +281,9 @@ async def update_blast(
 @router.delete("/{blast_id}")
 async def delete_blast(
     blast_id: str,
-    current_user: User = Depends(get_current_active_user)
+    blast_data: dict = Depends(require_blast_access(admin=True, action="delete"))
 ):
     """Delete message blast"""
-    blast = await message_blast_service.get_blast_by_id(blast_id)
-    if not blast:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Message blast not found"
-        )
-    
-    if not await verify_workspace_admin(current_user, blast.workspace_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only workspace administrators can delete message blasts"
-        )
-    
     try:
         success = await message_blast_service.delete_blast(blast_id)
         if not success:
@@ -211,105 +292,55 @@ async def delete_blast(
                 detail="Cannot delete blast in current status"
             )
         
+        await _invalidate_blast_cache(blast_id, blast_data["workspace_id"])
         return {"message": "Message blast deleted successfully"}
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/{blast_id}/progress", response_model=BlastProgress)
-async def get_blast_progress(
-    blast_id: str,
-    current_user: User = Depends(get_current_active_user)
-):
+@router.get("/{blast_id}/progress", response_model=BlastProgress, dependencies=[Depends(require_blast_access())])
+async def get_blast_progress(blast_id: str):
     """Get progress information for a blast"""
-    blast = await message_blast_service.get_blast_by_id(blast_id)
-    if not blast:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Message blast not found"
-        )
-    
-    if not await verify_workspace_access(current_user, blast.workspace_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied to blast"
-        )
+    async def load_progress():
+        progress = await message_blast_service.get_blast_progress(blast_id)
+        return dataclasses.asdict(progress)
     
-    return await message_blast_service.get_blast_progress(blast_id)
+    return await redis_get_or_set(
+        message_queue.redis_client, _progress_cache_key(blast_id),
+        BLAST_PROGRESS_CACHE_SECONDS, load_progress
+    )
 
-@router.get("/{blast_id}/targets", response_model=List[BlastTarget])
+@router.get("/{blast_id}/targets", response_model=List[BlastTarget], dependencies=[Depends(require_blast_access())])
 async def get_blast_targets(
     blast_id: str,
-    target_status: Optional[str] = Query(None),
-    current_user: User = Depends(get_current_active_user)
+    target_status: Optional[str] = Query(None)
 ):
     """Get targets for a blast with optional status filter"""
-    blast = await message_blast_service.get_blast_by_id(blast_id)
-    if not blast:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Message blast not found"
-        )
-    
-    if not await verify_workspace_access(current_user, blast.workspace_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied to blast"
-        )
-    
     return await message_blast_service.get_blast_targets(blast_id, target_status)
 
-@router.post("/{blast_id}/start")
+@router.post("/{blast_id}/start", status_code=status.HTTP_202_ACCEPTED)
 async def start_blast(
     blast_id: str,
-    current_user: User = Depends(get_current_active_user)
+    background_tasks: BackgroundTasks,
+    blast_data: dict = Depends(require_blast_access(admin=True, action="start"))
 ):
-    """Start a scheduled blast immediately"""
-    blast = await message_blast_service.get_blast_by_id(blast_id)
-    if not blast:
+    """Queue a scheduled blast to start right after the response"""
+    if blast_data.get("status") != BlastStatus.SCHEDULED:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Message blast not found"
+            status_code=400,
+            detail="Can only start scheduled blasts"
         )
     
-    if not await verify_workspace_admin(current_user, blast.workspace_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only workspace administrators can start message blasts"
-        )
+    background_tasks.add_task(_start_blast_in_background, blast_id, blast_data["workspace_id"])
     
-    try:
-        success = await message_blast_service.start_blast(blast_id)
-        if not success:
-            raise HTTPException(
-                status_code=400,
-                detail="Cannot start blast in current status"
-            )
-        
-        return {"message": "Message blast started successfully"}
-        
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    return {"message": "Message blast start queued"}
 
 @router.post("/{blast_id}/pause")
 async def pause_blast(
     blast_id: str,
-    current_user: User = Depends(get_current_active_user)
+    blast_data: dict = Depends(require_blast_access(admin=True, action="pause"))
 ):
     """Pause an active blast"""
-    blast = await message_blast_service.get_blast_by_id(blast_id)
-    if not blast:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Message blast not found"
-        )
-    
-    if not await verify_workspace_admin(current_user, blast.workspace_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only workspace administrators can pause message blasts"
-        )
-    
     success = await message_blast_service.pause_blast(blast_id)
     if not success:
         raise HTTPException(
@@ -317,27 +348,16 @@ async def pause_blast(
             detail="Cannot pause blast in current status"
         )
     
+    await _invalidate_blast_cache(blast_id, blast_data["workspace_id"])
+    
     return {"message": "Message blast paused successfully"}
 
 @router.post("/{blast_id}/resume")
 async def resume_blast(
     blast_id: str,
-    current_user: User = Depends(get_current_active_user)
+    blast_data: dict = Depends(require_blast_access(admin=True, action="resume"))
 ):
     """Resume a paused blast"""
-    blast = await message_blast_service.get_blast_by_id(blast_id)
-    if not blast:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Message blast not found"
-        )
-    
-    if not await verify_workspace_admin(current_user, blast.workspace_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only workspace administrators can resume message blasts"
-        )
-    
     success = await message_blast_service.resume_blast(blast_id)
     if not success:
         raise HTTPException(
@@ -345,27 +365,16 @@ async def resume_blast(
             detail="Cannot resume blast in current status"
         )
     
+    await _invalidate_blast_cache(blast_id, blast_data["workspace_id"])
+    
     return {"message": "Message blast resumed successfully"}
 
 @router.post("/{blast_id}/cancel")
 async def cancel_blast(
     blast_id: str,
-    current_user: User = Depends(get_current_active_user)
+    blast_data: dict = Depends(require_blast_access(admin=True, action="cancel"))
 ):
     """Cancel an active or scheduled blast"""
-    blast = await message_blast_service.get_blast_by_id(blast_id)
-    if not blast:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Message blast not found"
-        )
-    
-    if not await verify_workspace_admin(current_user, blast.workspace_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only workspace administrators can cancel message blasts"
-        )
-    
     success = await message_blast_service.cancel_blast(blast_id)
     if not success:
         raise HTTPException(
@@ -373,13 +382,15 @@ async def cancel_blast(
             detail="Cannot cancel blast in current status"
         )
     
+    await _invalidate_blast_cache(blast_id, blast_data["workspace_id"])
+    
     return {"message": "Message blast cancelled successfully"}
 
 @router.post("/upload-preview")
 async def preview_phone_numbers(
     workspace_id: str = Form(...),
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = CURRENT_USER
 ):
     """Preview phone numbers from uploaded Excel file"""
     if not await verify_workspace_admin(current_user, workspace_id):
@@ -397,10 +408,7 @@ async def preview_phone_numbers(
             )
         
         # Save file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        temp_file_path = await _spool_upload(file)
         
         try:
             # Extract phone numbers
@@ -417,9 +425,10 @@ async def preview_phone_numbers(
             
         finally:
             # Cleanup temp file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+            await _discard_upload(temp_file_path)
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Phone number preview failed: {e}")
         raise HTTPException(
@@ -431,9 +440,11 @@ async def preview_phone_numbers(
 async def get_blast_statistics(
     workspace_id: str,
     days: int = Query(30, description="Number of days to include in statistics"),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = CURRENT_USER
 ):
     """Get message blast statistics for workspace"""
+    workspace_oid = parse_object_id(workspace_id, "Invalid workspace ID")
+    
     if not await verify_workspace_access(current_user, workspace_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -441,31 +452,53 @@ async def get_blast_statistics(
         )
     
     try:
-        from app.database import get_database
-        from bson import ObjectId
-        
         db = get_database()
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         
-        # Get blast statistics
+        # One pass over the window returns the final statistics document
         pipeline = [
             {
                 "$match": {
-                    "workspace_id": ObjectId(workspace_id),
+                    "workspace_id": workspace_oid,
                     "created_at": {"$gte": cutoff_date}
                 }
             },
             {
                 "$group": {
-                    "_id": "$status",
-                    "count": {"$sum": 1},
-                    "total_sent": {"$sum": "$sent_count"},
-                    "total_failed": {"$sum": "$failed_count"}
+                    "_id": None,
+                    "total_blasts": {"$sum": 1},
+                    "active_blasts": {"$sum": {"$cond": [{"$eq": ["$status", BlastStatus.ACTIVE]}, 1, 0]}},
+                    "completed_blasts": {"$sum": {"$cond": [{"$eq": ["$status", BlastStatus.COMPLETED]}, 1, 0]}},
+                    "total_messages_sent": {"$sum": "$sent_count"},
+                    "total_messages_failed": {"$sum": "$failed_count"}
+                }
+            },
+            {
+                "$project": {
+                    "_id": 0,
+                    "total_blasts": 1,
+                    "active_blasts": 1,
+                    "completed_blasts": 1,
+                    "total_messages_sent": 1,
+                    "total_messages_failed": 1,
+                    "success_rate": {
+                        "$let": {
+                            "vars": {"total": {"$add": ["$total_messages_sent", "$total_messages_failed"]}},
+                            "in": {
+                                "$cond": [
+                                    {"$gt": ["$$total", 0]},
+                                    {"$round": [{"$multiply": [{"$divide": ["$total_messages_sent", "$$total"]}, 100]}, 2]},
+                                    0.0
+                                ]
+                            }
+                        }
+                    }
                 }
             }
         ]
         
-        stats = {
+        results = await db.message_blasts.aggregate(pipeline).to_list(1)
+        stats = results[0] if results else {
             "total_blasts": 0,
             "active_blasts": 0,
             "completed_blasts": 0,
@@ -474,24 +507,6 @@ async def get_blast_statistics(
             "success_rate": 0.0
         }
         
-        async for result in db.message_blasts.aggregate(pipeline):
-            blast_status = result["_id"]
-            count = result["count"]
-            
-            stats["total_blasts"] += count
-            stats["total_messages_sent"] += result.get("total_sent", 0)
-            stats["total_messages_failed"] += result.get("total_failed", 0)
-            
-            if blast_status == BlastStatus.ACTIVE:
-                stats["active_blasts"] = count
-            elif blast_status == BlastStatus.COMPLETED:
-                stats["completed_blasts"] = count
-        
-        # Calculate success rate
-        total_messages = stats["total_messages_sent"] + stats["total_messages_failed"]
-        if total_messages > 0:
-            stats["success_rate"] = round((stats["total_messages_sent"] / total_messages) * 100, 2)
-        
         return {
             "workspace_id": workspace_id,
             "period_days": days,
@@ -1,73 +1,104 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import Dict, Any, List
 from app.models.user import User
-from app.auth.auth_handler import get_current_active_user
+from app.auth.auth_handler import get_current_user
 from app.services.message_queue import message_queue
 from app.services.scheduler_service import scheduler_service
 from app.services.export_scheduler import export_scheduler
 from app.database import get_database
+from app.utils.cache_helpers import redis_get_or_set, redis_invalidate
 from datetime import datetime, timedelta
+import asyncio
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Dashboards poll these endpoints; a short TTL bounds staleness while sharing the work
+MONITOR_CACHE_SECONDS = 15
+HEALTH_CACHE_KEY = "monitor:health"
+QUEUE_STATS_CACHE_KEY = "monitor:queue_stats"
+
+# Failed-message retries run in batches, capped per request
+RETRY_BATCH_SIZE = 500
+RETRY_MAX_MESSAGES = 10_000
+RETRY_PROJECTION = {"_id": 0, "message_id": 1, "phone_number": 1, "from_phone": 1, "content": 1, "message_type": 1}
+
+async def _load_system_health() -> Dict[str, Any]:
+    """Assemble the system health payload"""
+    # Message queue stats and database health are independent I/O; run them together
+    db = get_database()
+    queue_stats, db_health = await asyncio.gather(
+        message_queue.get_queue_stats(),
+        _check_database_health(db),
+        return_exceptions=True
+    )
+    
+    # Scheduler status
+    scheduler_status = scheduler_service.get_job_status()
+    
+    # Export scheduler status
+    export_status = export_scheduler.get_scheduler_status()
+    
+    # Overall system status
+    system_status = "healthy"
+    issues = []
+    
+    # A failing component is reported as an issue instead of failing the whole check
+    if isinstance(queue_stats, Exception):
+        logger.error(f"Queue stats failed during health check: {queue_stats}")
+        issues.append("Message queue stats unavailable")
+        system_status = "warning"
+        queue_stats = {"error": str(queue_stats)}
+    
+    if isinstance(db_health, Exception):
+        db_health = {"connected": False, "error": str(db_health)}
+    
+    # Check for issues
+    if queue_stats.get('queue_length', 0) > 50:
+        issues.append("Message queue backing up")
+        system_status = "warning"
+    
+    if queue_stats.get('success_rate', 100) < 90:
+        issues.append("Low message processing success rate")
+        system_status = "warning"
+    
+    if not db_health.get('connected'):
+        issues.append("Database connection issues")
+        system_status = "error"
+    
+    if scheduler_status.get('status') != 'running':
+        issues.append("Scheduler not running")
+        system_status = "error"
+    
+    if export_status.get('status') != 'running':
+        issues.append("Export scheduler not running")
+        system_status = "error"
+    
+    return {
+        "system_status": system_status,
+        "timestamp": datetime.utcnow().isoformat(),
+        "issues": issues,
+        "components": {
+            "message_queue": queue_stats,
+            "scheduler": scheduler_status,
+            "export_scheduler": export_status,
+            "database": db_health
+        }
+    }
+
 @router.get("/system/health")
 async def get_system_health(
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get comprehensive system health status"""
     try:
-        # Message queue stats
-        queue_stats = await message_queue.get_queue_stats()
-        
-        # Scheduler status
-        scheduler_status = scheduler_service.get_job_status()
-        
-        # Export scheduler status
-        export_status = export_scheduler.get_scheduler_status()
-        
-        # Database health
-        db = get_database()
-        db_health = await _check_database_health(db)
-        
-        # Overall system status
-        system_status = "healthy"
-        issues = []
-        
-        # Check for issues
-        if queue_stats.get('queue_length', 0) > 50:
-            issues.append("Message queue backing up")
-            system_status = "warning"
-        
-        if queue_stats.get('success_rate', 100) < 90:
-            issues.append("Low message processing success rate")
-            system_status = "warning"
-        
-        if not db_health.get('connected'):
-            issues.append("Database connection issues")
-            system_status = "error"
-        
-        if scheduler_status.get('status') != 'running':
-            issues.append("Scheduler not running")
-            system_status = "error"
-        
-        if export_status.get('status') != 'running':
-            issues.append("Export scheduler not running")
-            system_status = "error"
-        
-        return {
-            "system_status": system_status,
-            "timestamp": datetime.utcnow().isoformat(),
-            "issues": issues,
-            "components": {
-                "message_queue": queue_stats,
-                "scheduler": scheduler_status,
-                "export_scheduler": export_status,
-                "database": db_health
-            }
-        }
+        return await redis_get_or_set(
+            message_queue.redis_client, HEALTH_CACHE_KEY,
+            MONITOR_CACHE_SECONDS, _load_system_health
+        )
         
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -76,39 +107,46 @@ async def get_system_health(
             detail="Health check failed"
         )
 
+async def _load_queue_statistics() -> Dict[str, Any]:
+    """Assemble the queue statistics payload"""
+    stats = await message_queue.get_queue_stats()
+    
+    # Get additional metrics
+    db = get_database()
+    
+    # Messages by hour for last 24 hours
+    hourly_stats = await _get_hourly_message_stats(db)
+    
+    # Failed messages details
+    failed_messages = await db.message_queue.find({
+        "status": "failed",
+        "created_at": {"$gte": datetime.utcnow() - timedelta(hours=24)}
+    }).limit(10).to_list(None)
+    
+    return {
+        "current_stats": stats,
+        "hourly_breakdown": hourly_stats,
+        "recent_failures": [
+            {
+                "message_id": msg["message_id"],
+                "error": msg.get("error_log", [])[-1] if msg.get("error_log") else None,
+                "created_at": msg["created_at"].isoformat(),
+                "retry_count": msg.get("retry_count", 0)
+            }
+            for msg in failed_messages
+        ]
+    }
+
 @router.get("/queue/stats")
 async def get_queue_statistics(
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get detailed message queue statistics"""
     try:
-        stats = await message_queue.get_queue_stats()
-        
-        # Get additional metrics
-        db = get_database()
-        
-        # Messages by hour for last 24 hours
-        hourly_stats = await _get_hourly_message_stats(db)
-        
-        # Failed messages details
-        failed_messages = await db.message_queue.find({
-            "status": "failed",
-            "created_at": {"$gte": datetime.utcnow() - timedelta(hours=24)}
-        }).limit(10).to_list(None)
-        
-        return {
-            "current_stats": stats,
-            "hourly_breakdown": hourly_stats,
-            "recent_failures": [
-                {
-                    "message_id": msg["message_id"],
-                    "error": msg.get("error_log", [])[-1] if msg.get("error_log") else None,
-                    "created_at": msg["created_at"].isoformat(),
-                    "retry_count": msg.get("retry_count", 0)
-                }
-                for msg in failed_messages
-            ]
-        }
+        return await redis_get_or_set(
+            message_queue.redis_client, QUEUE_STATS_CACHE_KEY,
+            MONITOR_CACHE_SECONDS, _load_queue_statistics
+        )
         
     except Exception as e:
         logger.error(f"Failed to get queue statistics: {e}")
@@ -117,52 +155,37 @@ async def get_queue_statistics(
             detail="Failed to get queue statistics"
         )
 
+async def _load_performance_metrics(hours: int) -> Dict[str, Any]:
+    """Assemble the performance metrics payload for the last `hours` hours"""
+    db = get_database()
+    cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+    
+    # The three aggregations are independent; run them concurrently
+    processing_metrics, chat_metrics, ai_metrics = await asyncio.gather(
+        _get_message_processing_metrics(db, cutoff_time),
+        _get_chat_activity_metrics(db, cutoff_time),
+        _get_ai_response_metrics(db, cutoff_time)
+    )
+    
+    return {
+        "time_period": f"Last {hours} hours",
+        "message_processing": processing_metrics,
+        "chat_activity": chat_metrics,
+        "ai_responses": ai_metrics,
+        "generated_at": datetime.utcnow().isoformat()
+    }
+
 @router.get("/performance/metrics")
 async def get_performance_metrics(
     hours: int = 24,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get system performance metrics"""
     try:
-        db = get_database()
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-        
-        # Message processing metrics
-        pipeline = [
-            {
-                "$match": {
-                    "created_at": {"$gte": cutoff_time}
-                }
-            },
-            {
-                "$group": {
-                    "_id": "$status",
-                    "count": {"$sum": 1},
-                    "avg_processing_time": {"$avg": "$processing_time"}
-                }
-            }
-        ]
-        
-        processing_metrics = {}
-        async for result in db.message_queue.aggregate(pipeline):
-            processing_metrics[result["_id"]] = {
-                "count": result["count"],
-                "avg_processing_time": round(result.get("avg_processing_time", 0), 2)
-            }
-        
-        # Chat activity metrics
-        chat_metrics = await _get_chat_activity_metrics(db, cutoff_time)
-        
-        # AI response metrics
-        ai_metrics = await _get_ai_response_metrics(db, cutoff_time)
-        
-        return {
-            "time_period": f"Last {hours} hours",
-            "message_processing": processing_metrics,
-            "chat_activity": chat_metrics,
-            "ai_responses": ai_metrics,
-            "generated_at": datetime.utcnow().isoformat()
-        }
+        return await redis_get_or_set(
+            message_queue.redis_client, f"monitor:performance:{hours}",
+            MONITOR_CACHE_SECONDS, lambda: _load_performance_metrics(hours)
+        )
         
     except Exception as e:
         logger.error(f"Failed to get performance metrics: {e}")
@@ -173,7 +196,7 @@ async def get_performance_metrics(
 
 @router.post("/queue/retry-failed")
 async def retry_failed_messages(
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Retry all failed messages in the queue"""
     try:
@@ -186,53 +209,40 @@ async def retry_failed_messages(
         
         db = get_database()
         
-        # Get failed messages
-        failed_messages = await db.message_queue.find({
-            "status": "failed",
-            "retry_count": {"$lt": 3}
-        }).to_list(None)
-        
-        if not failed_messages:
+        # Stream failed messages with only the fields the queue payload needs
+        cursor = db.message_queue.find(
+            {"status": "failed", "retry_count": {"$lt": 3}},
+            projection=RETRY_PROJECTION
+        ).limit(RETRY_MAX_MESSAGES).batch_size(RETRY_BATCH_SIZE)
+        
+        enqueued_at = datetime.utcnow().isoformat()
+        retried_count = 0
+        batch = []
+        async for msg in cursor:
+            batch.append(msg)
+            if len(batch) == RETRY_BATCH_SIZE:
+                await _requeue_failed_batch(db, batch, enqueued_at)
+                retried_count += len(batch)
+                batch = []
+        
+        if batch:
+            await _requeue_failed_batch(db, batch, enqueued_at)
+            retried_count += len(batch)
+        
+        if not retried_count:
             return {
                 "success": True,
                 "message": "No failed messages to retry",
                 "retried_count": 0
             }
         
-        # Reset failed messages for retry
-        message_ids = [msg["message_id"] for msg in failed_messages]
-        
-        await db.message_queue.update_many(
-            {"message_id": {"$in": message_ids}},
-            {"$set": {
-                "status": "pending",
-                "retry_count": 0,
-                "error_log": [],
-                "updated_at": datetime.utcnow()
-            }}
-        )
-        
-        # Re-enqueue messages
-        import json
-        for msg in failed_messages:
-            queue_data = {
-                "message_id": msg["message_id"],
-                "data": {
-                    "phone_number": msg.get("phone_number"),
-                    "from": msg.get("from_phone"),
-                    "message": msg.get("content"),
-                    "type": msg.get("message_type", "text")
-                },
-                "enqueued_at": datetime.utcnow().isoformat(),
-                "priority": "retry"
-            }
-            
-            await message_queue.redis_client.lpush("whatsapp_messages", json.dumps(queue_data))
+        # Queue length and failure counts just changed; per-window performance entries age out on their own
+        await redis_invalidate(message_queue.redis_client, HEALTH_CACHE_KEY, QUEUE_STATS_CACHE_KEY)
         
         return {
             "success": True,
-            "message": f"Retried {len(failed_messages)} failed messages",
-            "retried_count": len(failed_messages)
+            "message": f"Retried {retried_count} failed messages",
+            "retried_count": retried_count
         }
         
     except Exception as e:
@@ -242,22 +252,51 @@ async def retry_failed_messages(
             detail="Failed to retry failed messages"
         )
 
+async def _requeue_failed_batch(db, batch: List[Dict[str, Any]], enqueued_at: str):
+    """Reset a batch of failed messages to pending and push them back onto the queue"""
+    await db.message_queue.update_many(
+        {"message_id": {"$in": [msg["message_id"] for msg in batch]}},
+        {"$set": {
+            "status": "pending",
+            "retry_count": 0,
+            "error_log": [],
+            "updated_at": datetime.utcnow()
+        }}
+    )
+    
+    # One variadic LPUSH per batch instead of a round trip per message
+    payloads = [
+        orjson.dumps({
+            "message_id": msg["message_id"],
+            "data": {
+                "phone_number": msg.get("phone_number"),
+                "from": msg.get("from_phone"),
+                "message": msg.get("content"),
+                "type": msg.get("message_type", "text")
+            },
+            "enqueued_at": enqueued_at,
+            "priority": "retry"
+        })
+        for msg in batch
+    ]
+    await message_queue.redis_client.lpush("whatsapp_messages", *payloads)
+
 async def _check_database_health(db) -> Dict[str, Any]:
     """Check database connection and performance"""
     try:
         # Test connection
         await db.command("ping")
         
-        # Get collection stats
+        # Get collection stats from metadata counts instead of scanning each collection
         collections = ["users", "workspaces", "chats", "messages", "documents"]
-        collection_stats = {}
-        
-        for collection_name in collections:
-            try:
-                count = await db[collection_name].count_documents({})
-                collection_stats[collection_name] = count
-            except Exception as e:
-                collection_stats[collection_name] = f"Error: {e}"
+        counts = await asyncio.gather(
+            *(db[collection_name].estimated_document_count() for collection_name in collections),
+            return_exceptions=True
+        )
+        collection_stats = {
+            collection_name: f"Error: {count}" if isinstance(count, Exception) else count
+            for collection_name, count in zip(collections, counts)
+        }
         
         return {
             "connected": True,
@@ -273,38 +312,19 @@ async def _check_database_health(db) -> Dict[str, Any]:
         }
 
 async def _get_hourly_message_stats(db) -> List[Dict[str, Any]]:
-    """Get message statistics by hour for last 24 hours"""
+    """Get message statistics by hour for last 24 hours from the scheduled rollup"""
     try:
-        pipeline = [
-            {
-                "$match": {
-                    "created_at": {"$gte": datetime.utcnow() - timedelta(hours=24)}
-                }
-            },
-            {
-                "$group": {
-                    "_id": {
-                        "hour": {"$hour": "$created_at"},
-                        "status": "$status"
-                    },
-                    "count": {"$sum": 1}
-                }
-            },
-            {
-                "$sort": {"_id.hour": 1}
-            }
-        ]
+        cutoff = (datetime.utcnow() - timedelta(hours=24)).replace(minute=0, second=0, microsecond=0)
+        buckets = await db.message_queue_hourly.find(
+            {"hour_bucket": {"$gte": cutoff}},
+            {"_id": 0, "hour_bucket": 1, "status": 1, "count": 1}
+        ).to_list(None)
         
         hourly_data = {}
-        async for result in db.message_queue.aggregate(pipeline):
-            hour = result["_id"]["hour"]
-            status = result["_id"]["status"]
-            count = result["count"]
-            
-            if hour not in hourly_data:
-                hourly_data[hour] = {}
-            
-            hourly_data[hour][status] = count
+        for bucket in buckets:
+            hour = bucket["hour_bucket"].hour
+            stats = hourly_data.setdefault(hour, {})
+            stats[bucket["status"]] = stats.get(bucket["status"], 0) + bucket["count"]
         
         return [
             {
@@ -318,25 +338,60 @@ async def _get_hourly_message_stats(db) -> List[Dict[str, Any]]:
         logger.error(f"Failed to get hourly stats: {e}")
         return []
 
+async def _get_message_processing_metrics(db, cutoff_time: datetime) -> Dict[str, Any]:
+    """Get message processing metrics per queue status"""
+    pipeline = [
+        {
+            "$match": {
+                "created_at": {"$gte": cutoff_time}
+            }
+        },
+        {
+            "$group": {
+                "_id": "$status",
+                "count": {"$sum": 1},
+                "avg_processing_time": {"$avg": "$processing_time"}
+            }
+        }
+    ]
+    
+    processing_metrics = {}
+    async for result in db.message_queue.aggregate(pipeline):
+        processing_metrics[result["_id"]] = {
+            "count": result["count"],
+            "avg_processing_time": round(result.get("avg_processing_time", 0), 2)
+        }
+    
+    return processing_metrics
+
 async def _get_chat_activity_metrics(db, cutoff_time: datetime) -> Dict[str, Any]:
     """Get chat activity metrics"""
     try:
-        # Active chats
-        active_chats = await db.chats.count_documents({
-            "status": "active",
-            "last_message_at": {"$gte": cutoff_time}
-        })
-        
-        # New chats
-        new_chats = await db.chats.count_documents({
-            "created_at": {"$gte": cutoff_time}
-        })
-        
-        # Qualified leads
-        qualified_leads = await db.chats.count_documents({
-            "status": "qualified",
-            "updated_at": {"$gte": cutoff_time}
-        })
+        active_match = {"status": "active", "last_message_at": {"$gte": cutoff_time}}
+        new_match = {"created_at": {"$gte": cutoff_time}}
+        qualified_match = {"status": "qualified", "updated_at": {"$gte": cutoff_time}}
+        
+        # Active chats, new chats and qualified leads in one pipeline; the $or
+        # lets each branch use its own index before the conditional sums
+        results = await db.chats.aggregate([
+            {"$match": {"$or": [active_match, new_match, qualified_match]}},
+            {
+                "$group": {
+                    "_id": None,
+                    "active_chats": {"$sum": {"$cond": [{
+                        "$and": [{"$eq": ["$status", "active"]}, {"$gte": ["$last_message_at", cutoff_time]}]
+                    }, 1, 0]}},
+                    "new_chats": {"$sum": {"$cond": [{"$gte": ["$created_at", cutoff_time]}, 1, 0]}},
+                    "qualified_leads": {"$sum": {"$cond": [{
+                        "$and": [{"$eq": ["$status", "qualified"]}, {"$gte": ["$updated_at", cutoff_time]}]
+                    }, 1, 0]}}
+                }
+            }
+        ]).to_list(1)
+        counts = results[0] if results else {}
+        active_chats = counts.get("active_chats", 0)
+        new_chats = counts.get("new_chats", 0)
+        qualified_leads = counts.get("qualified_leads", 0)
         
         return {
             "active_chats": active_chats,
@@ -351,17 +406,25 @@ async def _get_chat_activity_metrics(db, cutoff_time: datetime) -> Dict[str, Any
 async def _get_ai_response_metrics(db, cutoff_time: datetime) -> Dict[str, Any]:
     """Get AI response performance metrics"""
     try:
-        # AI generated messages
-        ai_messages = await db.messages.count_documents({
-            "is_ai_generated": True,
-            "timestamp": {"$gte": cutoff_time}
-        })
-        
-        # Total outgoing messages
-        total_outgoing = await db.messages.count_documents({
-            "direction": "outgoing",
-            "timestamp": {"$gte": cutoff_time}
-        })
+        # AI generated and total outgoing messages in one pass over the window
+        results = await db.messages.aggregate([
+            {
+                "$match": {
+                    "timestamp": {"$gte": cutoff_time},
+                    "$or": [{"is_ai_generated": True}, {"direction": "outgoing"}]
+                }
+            },
+            {
+                "$group": {
+                    "_id": None,
+                    "ai_messages": {"$sum": {"$cond": [{"$eq": ["$is_ai_generated", True]}, 1, 0]}},
+                    "total_outgoing": {"$sum": {"$cond": [{"$eq": ["$direction", "outgoing"]}, 1, 0]}}
+                }
+            }
+        ]).to_list(1)
+        counts = results[0] if results else {}
+        ai_messages = counts.get("ai_messages", 0)
+        total_outgoing = counts.get("total_outgoing", 0)
         
         # Calculate AI usage percentage
         ai_percentage = (ai_messages / total_outgoing * 100) if total_outgoing > 0 else 0
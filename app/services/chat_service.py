@@ -1,18 +1,159 @@
 from typing import List, Optional, Dict, Any
 from app.models.chat import Chat, ChatCreate, ChatUpdate, Message, MessageCreate, ChatSummary, ChatStatus
-from app.models.workspace import Workspace, WorkflowStep
+from app.models.workspace import WorkflowStep
 from app.services.openai_service import openai_service
 from app.services.document_service import document_service
 from app.services.whatsapp_service import whatsapp_service
 from app.services.workflow_service import workflow_service
+from app.services.ai_settings_service import ai_settings_service
 from app.database import get_database
 from bson import ObjectId
+from pymongo import InsertOne, UpdateOne
 from datetime import datetime
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+class MessageWriteBuffer:
+    """Coalesce message inserts and chat last_message_at bumps into periodic bulk writes"""
+    
+    def __init__(self, flush_interval: float = 0.05, max_pending: int = 5000,
+                 retry_interval: float = 1.0, max_write_attempts: int = 5):
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self.max_write_attempts = max_write_attempts
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.pending_chats: Dict[str, int] = {}
+        self.write_attempts: Dict[ObjectId, int] = {}
+        self.flush_lock = asyncio.Lock()
+        self.wakeup = asyncio.Event()
+        self.drain_task: Optional[asyncio.Task] = None
+    
+    def enqueue(self, message_dict: Dict[str, Any]) -> bool:
+        """Queue a message for the next bulk write; False when the buffer cannot take it"""
+        if self.drain_task is None or self.drain_task.done():
+            self.drain_task = asyncio.create_task(self._drain())
+        
+        try:
+            self.queue.put_nowait(message_dict)
+        except asyncio.QueueFull:
+            return False
+        
+        chat_id = message_dict["chat_id"]
+        self.pending_chats[chat_id] = self.pending_chats.get(chat_id, 0) + 1
+        self.wakeup.set()
+        return True
+    
+    def has_pending(self, chat_id: str) -> bool:
+        """Check whether a chat has messages not yet written"""
+        return chat_id in self.pending_chats
+    
+    async def flush(self) -> int:
+        """Write every queued message in one ordered=False bulk insert; returns how many were requeued"""
+        async with self.flush_lock:
+            batch = []
+            while not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            if not batch:
+                return 0
+            
+            db = get_database()
+            failed = []
+            try:
+                await db.messages.bulk_write([InsertOne(message) for message in batch], ordered=False)
+            except Exception as e:
+                logger.error(f"Bulk message write failed, retrying {len(batch)} messages individually: {e}")
+                for message in batch:
+                    try:
+                        await db.messages.replace_one({"_id": message["_id"]}, message, upsert=True)
+                    except Exception as insert_error:
+                        logger.error(f"Failed to write message {message['_id']}: {insert_error}")
+                        failed.append(message)
+            
+            failed_ids = {message["_id"] for message in failed}
+            written = [message for message in batch if message["_id"] not in failed_ids]
+            
+            last_message_at: Dict[str, datetime] = {}
+            for message in written:
+                last_message_at[message["chat_id"]] = message["timestamp"]
+            
+            if last_message_at:
+                try:
+                    await db.chats.bulk_write([
+                        UpdateOne({"_id": ObjectId(chat_id)}, {"$set": {"last_message_at": timestamp}})
+                        for chat_id, timestamp in last_message_at.items()
+                    ], ordered=False)
+                except Exception as e:
+                    logger.error(f"Failed to update chat last message times: {e}")
+            
+            for message in written:
+                self.write_attempts.pop(message["_id"], None)
+                self._release_pending(message["chat_id"])
+            
+            return self._requeue(failed)
+    
+    def _requeue(self, failed: List[Dict[str, Any]]) -> int:
+        """Put messages that failed every write back on the queue until they run out of attempts"""
+        requeued = 0
+        for message in failed:
+            attempts = self.write_attempts.get(message["_id"], 0) + 1
+            if attempts < self.max_write_attempts:
+                try:
+                    self.queue.put_nowait(message)
+                    self.write_attempts[message["_id"]] = attempts
+                    requeued += 1
+                    continue
+                except asyncio.QueueFull:
+                    pass
+            logger.critical(
+                f"Dropping message {message['_id']} for chat {message['chat_id']} after {attempts} failed write attempt(s)"
+            )
+            self.write_attempts.pop(message["_id"], None)
+            self._release_pending(message["chat_id"])
+        
+        if requeued:
+            self.wakeup.set()
+        return requeued
+    
+    def _release_pending(self, chat_id: str):
+        """Count one of a chat's buffered messages as no longer pending"""
+        remaining = self.pending_chats.get(chat_id, 1) - 1
+        if remaining > 0:
+            self.pending_chats[chat_id] = remaining
+        else:
+            self.pending_chats.pop(chat_id, None)
+    
+    async def _drain(self):
+        """Sleep until a message is enqueued, gather more for flush_interval, then flush; back off while writes fail"""
+        while True:
+            await self.wakeup.wait()
+            await asyncio.sleep(self.flush_interval)
+            self.wakeup.clear()
+            try:
+                if await self.flush():
+                    await asyncio.sleep(self.retry_interval)
+            except Exception as e:
+                logger.error(f"Message write buffer flush error: {e}")
+    
+    async def close(self):
+        """Stop the drain task and write anything still queued"""
+        if self.drain_task:
+            self.drain_task.cancel()
+            self.drain_task = None
+        
+        for _ in range(self.max_write_attempts):
+            if not await self.flush():
+                return
+        
+        while not self.queue.empty():
+            message = self.queue.get_nowait()
+            logger.critical(f"Dropping message {message['_id']} for chat {message['chat_id']} at shutdown: it could not be written")
+
 class ChatService:
+    def __init__(self):
+        self.message_buffer = MessageWriteBuffer()
+    
     async def create_chat(self, chat_data: ChatCreate) -> Chat:
         """Create new chat"""
         db = get_database()
@@ -26,7 +167,7 @@ class ChatService:
         chat_dict["_id"] = str(result.inserted_id)
         chat_dict["workspace_id"] = chat_data.workspace_id
         
-        return Chat(**chat_dict)
+        return Chat.from_db(chat_dict)
     
     async def get_workspace_chats(self, workspace_id: str) -> List[Chat]:
         """Get all chats for a workspace"""
@@ -91,17 +232,17 @@ class ChatService:
         message_dict["chat_id"] = chat_id
         message_dict["content"] = message_data.content.strip()
         message_dict["timestamp"] = datetime.utcnow()
+        message_dict["_id"] = ObjectId()
         
-        result = await db.messages.insert_one(message_dict)
-        message_dict["_id"] = str(result.inserted_id)
-        
-        # Update chat last message time
-        await db.chats.update_one(
-            {"_id": ObjectId(chat_id)},
-            {"$set": {"last_message_at": datetime.utcnow()}}
-        )
+        # Buffered for the next bulk write; written immediately if the buffer is full
+        if not self.message_buffer.enqueue(message_dict):
+            await db.messages.insert_one(message_dict)
+            await db.chats.update_one(
+                {"_id": ObjectId(chat_id)},
+                {"$set": {"last_message_at": message_dict["timestamp"]}}
+            )
         
-        return Message(**message_dict)
+        return Message.from_db(dict(message_dict))
     
     async def process_ai_response(self, chat_id: str, user_message: str) -> Optional[Message]:
         """Process AI response for incoming message"""
@@ -110,17 +251,8 @@ class ChatService:
             if not chat or not chat.ai_enabled:
                 return None
             
-            # Get workspace and its settings
-            db = get_database()
-            workspace_data = await db.workspaces.find_one({"_id": ObjectId(chat.workspace_id)})
-            if not workspace_data:
-                return None
-            
-            workspace_data["_id"] = str(workspace_data["_id"])
-            workspace = Workspace(**workspace_data)
-            
-            # Get AI settings
-            ai_settings = workspace_data.get('ai_settings', {})
+            # Get AI settings (loaded on their own, not with the workspace)
+            ai_settings = await ai_settings_service.get_prompt_settings(chat.workspace_id)
             
             # Get workflow steps for this workspace
             workflow_steps = await workflow_service.get_workspace_workflow_steps(chat.workspace_id)
@@ -242,7 +374,7 @@ class ChatService:
             # Generate AI response
             ai_response = await openai_service.generate_response(
                 conversation_history,
-                workspace.prompt_settings,
+                ai_settings,
                 context_documents
             )
             
@@ -355,6 +487,10 @@ class ChatService:
     
     async def _get_chat_messages(self, chat_id: str) -> List[Message]:
         """Get messages for a chat"""
+        # Read-your-writes: make sure buffered messages for this chat are stored
+        if self.message_buffer.has_pending(chat_id):
+            await self.message_buffer.flush()
+        
         db = get_database()
         cursor = db.messages.find({"chat_id": chat_id}).sort("timestamp", 1)
         
@@ -365,4 +501,8 @@ class ChatService:
         
         return messages
 
+    async def close(self):
+        """Write any buffered messages before shutdown"""
+        await self.message_buffer.close()
+
 chat_service = ChatService()
\ No newline at end of file
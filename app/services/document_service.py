@@ -1,6 +1,6 @@
 import aiofiles
 import os
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
 from fastapi import UploadFile, HTTPException
 from app.config import settings
 from app.models.document import (
@@ -11,6 +11,7 @@ from app.services.openai_service import openai_service
 from app.services.excel_processor import excel_processor
 from app.database import get_database
 from bson import ObjectId
+from pymongo import ReturnDocument
 import PyPDF2
 import docx
 import logging
@@ -18,12 +19,18 @@ from datetime import datetime
 import hashlib
 import re
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+from app.utils.embedding_helpers import cosine_similarity_score, pack_embedding, unpack_embedding
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
+import functools
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=1024)
+def _esc(query: str) -> str:
+    """Escape user input for use inside a Mongo $regex"""
+    return re.escape(query)
+
 class DocumentService:
     def __init__(self):
         self.upload_dir = settings.upload_dir
@@ -133,7 +140,7 @@ class DocumentService:
             doc_dict["status"] = DocumentStatus.READY
             doc_dict["processed_at"] = datetime.utcnow()
             
-            return Document(**doc_dict)
+            return Document.from_db(doc_dict)
             
         except Exception as e:
             logger.error(f"Document upload error: {e}")
@@ -195,7 +202,7 @@ class DocumentService:
                             "workspace_id": ObjectId(workspace_id),
                             "content": chunk_content,
                             "chunk_index": i,
-                            "embedding": embedding,
+                            "embedding": pack_embedding(embedding),
                             "metadata": combined_metadata,
                             "created_at": datetime.utcnow()
                         }
@@ -263,10 +270,45 @@ class DocumentService:
         
         return chunks
     
-    async def get_workspace_documents(self, workspace_id: str) -> List[Document]:
-        """Get all documents for a workspace with stats"""
+    def _build_documents_query(
+        self,
+        workspace_id: str,
+        document_type: Optional[str] = None,
+        status: Optional[str] = None,
+        search: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build the Mongo filter for a workspace document listing"""
+        query: Dict[str, Any] = {"workspace_id": ObjectId(workspace_id)}
+        
+        if document_type:
+            query["document_type"] = document_type
+        
+        if status:
+            query["status"] = status
+        
+        if search:
+            pattern = {"$regex": _esc(search), "$options": "i"}
+            query["$or"] = [
+                {"title": pattern},
+                {"file_name": pattern},
+                {"description": pattern}
+            ]
+        
+        return query
+    
+    async def get_workspace_documents(
+        self,
+        workspace_id: str,
+        document_type: Optional[str] = None,
+        status: Optional[str] = None,
+        search: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 0
+    ) -> List[Document]:
+        """Get a filtered, paginated page of documents for a workspace"""
         db = get_database()
-        cursor = db.documents.find({"workspace_id": ObjectId(workspace_id)}).sort("created_at", -1)
+        query = self._build_documents_query(workspace_id, document_type, status, search)
+        cursor = db.documents.find(query).sort("created_at", -1).skip(offset).limit(limit)
         documents = []
         
         async for doc in cursor:
@@ -276,35 +318,125 @@ class DocumentService:
         
         return documents
     
-    async def get_document_by_id(self, document_id: str, workspace_id: str) -> Optional[Document]:
-        """Get document by ID and update access stats"""
+    async def iter_workspace_documents(
+        self,
+        workspace_id: str,
+        document_type: Optional[str] = None,
+        status: Optional[str] = None,
+        search: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield raw document rows for a workspace listing one at a time, without embeddings"""
         db = get_database()
+        query = self._build_documents_query(workspace_id, document_type, status, search)
+        cursor = db.documents.find(query, projection={"embedding": 0}).sort("created_at", -1).skip(offset).limit(limit)
         
-        # Update access stats
-        await db.documents.update_one(
-            {"_id": ObjectId(document_id), "workspace_id": ObjectId(workspace_id)},
+        async for doc in cursor:
+            yield doc
+    
+    async def list_with_stats(
+        self,
+        workspace_id: str,
+        document_type: Optional[str] = None,
+        status: Optional[str] = None,
+        search: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """Get a page of documents, the filtered total and workspace stats in one aggregation"""
+        db = get_database()
+        query = self._build_documents_query(workspace_id, document_type, status, search)
+        query.pop("workspace_id")
+        
+        pipeline = [
+            {"$match": {"workspace_id": ObjectId(workspace_id)}},
             {
-                "$inc": {"access_count": 1},
-                "$set": {"last_accessed": datetime.utcnow()}
+                "$facet": {
+                    "items": [
+                        {"$match": query},
+                        {"$sort": {"created_at": -1}},
+                        {"$skip": offset},
+                        {"$limit": limit}
+                    ],
+                    "total": [
+                        {"$match": query},
+                        {"$count": "n"}
+                    ],
+                    "totals": [
+                        {
+                            "$group": {
+                                "_id": None,
+                                "total_documents": {"$sum": 1},
+                                "total_size": {"$sum": "$file_size"},
+                                "total_chunks": {"$sum": "$chunk_count"},
+                                "avg_access_count": {"$avg": "$access_count"}
+                            }
+                        }
+                    ],
+                    "by_type": [{"$group": {"_id": "$document_type", "c": {"$sum": 1}}}],
+                    "by_status": [{"$group": {"_id": "$status", "c": {"$sum": 1}}}]
+                }
             }
-        )
+        ]
         
-        doc_data = await db.documents.find_one({
-            "_id": ObjectId(document_id),
-            "workspace_id": ObjectId(workspace_id)
-        })
+        result = (await db.documents.aggregate(pipeline).to_list(1))[0]
+        
+        items = []
+        for doc in result["items"]:
+            doc["_id"] = str(doc["_id"])
+            doc["workspace_id"] = workspace_id
+            items.append(Document(**doc))
+        
+        totals = result["totals"][0] if result["totals"] else {}
+        return {
+            "items": items,
+            "total": result["total"][0]["n"] if result["total"] else 0,
+            "stats": {
+                "total_documents": totals.get("total_documents", 0),
+                "total_size": totals.get("total_size", 0),
+                "total_chunks": totals.get("total_chunks", 0),
+                "avg_access_count": round(totals.get("avg_access_count") or 0, 2),
+                "type_breakdown": {row["_id"]: row["c"] for row in result["by_type"]},
+                "status_breakdown": {row["_id"]: row["c"] for row in result["by_status"]}
+            }
+        }
+    
+    async def get_document_by_id(self, document_oid: ObjectId) -> Optional[Tuple[Document, str]]:
+        """Get document by ID together with its workspace ID"""
+        db = get_database()
+        doc_data = await db.documents.find_one({"_id": document_oid})
         
         if not doc_data:
             return None
         
+        workspace_id = str(doc_data["workspace_id"])
         doc_data["_id"] = str(doc_data["_id"])
         doc_data["workspace_id"] = workspace_id
         
-        return Document(**doc_data)
+        return Document(**doc_data), workspace_id
+    
+    async def get_document_workspace_id(self, document_oid: ObjectId) -> Optional[str]:
+        """Get only the workspace ID a document belongs to"""
+        db = get_database()
+        doc_data = await db.documents.find_one({"_id": document_oid}, projection={"workspace_id": 1})
+        
+        return str(doc_data["workspace_id"]) if doc_data else None
+    
+    async def record_document_access(self, document_oid: ObjectId) -> None:
+        """Update document access stats"""
+        db = get_database()
+        await db.documents.update_one(
+            {"_id": document_oid},
+            {
+                "$inc": {"access_count": 1},
+                "$set": {"last_accessed": datetime.utcnow()}
+            }
+        )
     
     async def update_document(
         self, 
-        document_id: str, 
+        document_oid: ObjectId, 
         workspace_id: str, 
         update_data: Dict[str, Any]
     ) -> Optional[Document]:
@@ -313,29 +445,33 @@ class DocumentService:
         
         update_data["updated_at"] = datetime.utcnow()
         
-        result = await db.documents.update_one(
-            {"_id": ObjectId(document_id), "workspace_id": ObjectId(workspace_id)},
-            {"$set": update_data}
+        doc_data = await db.documents.find_one_and_update(
+            {"_id": document_oid, "workspace_id": ObjectId(workspace_id)},
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER
         )
         
-        if result.modified_count == 0:
+        if not doc_data:
             return None
         
-        return await self.get_document_by_id(document_id, workspace_id)
+        doc_data["_id"] = str(doc_data["_id"])
+        doc_data["workspace_id"] = workspace_id
+        
+        return Document(**doc_data)
     
-    async def delete_document(self, document_id: str, workspace_id: str) -> bool:
+    async def delete_document(self, document_oid: ObjectId, workspace_id: str) -> bool:
         """Delete a document and its chunks"""
         db = get_database()
         
-        # Delete document chunks first
+        # Delete document chunks first (chunks reference the document by its string id)
         await db.document_chunks.delete_many({
-            "document_id": document_id,
+            "document_id": str(document_oid),
             "workspace_id": ObjectId(workspace_id)
         })
         
         # Delete document
         result = await db.documents.delete_one({
-            "_id": ObjectId(document_id),
+            "_id": document_oid,
             "workspace_id": ObjectId(workspace_id)
         })
         
@@ -356,6 +492,7 @@ class DocumentService:
             if not query_embedding:
                 logger.warning("Failed to generate query embedding")
                 return []
+            query_embedding = unpack_embedding(query_embedding)
             
             logger.info("Query embedding generated successfully")
             
@@ -409,10 +546,7 @@ class DocumentService:
                 chunk_count += 1
                 if chunk.get("embedding"):
                     try:
-                        similarity = cosine_similarity(
-                            [query_embedding],
-                            [chunk["embedding"]]
-                        )[0][0]
+                        similarity = cosine_similarity_score(query_embedding, chunk["embedding"])
                     except Exception as e:
                         logger.warning(f"Failed to calculate similarity for chunk: {e}")
                         continue
@@ -490,54 +624,83 @@ class DocumentService:
             logger.error(f"Document search error: {e}")
             return []
     
+    async def get_search_suggestions(self, workspace_id: str, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Get title suggestions for documents whose title, description or tags start with query"""
+        db = get_database()
+        
+        prefix = {"$regex": f"^{_esc(query)}", "$options": "i"}
+        pipeline = [
+            {
+                "$match": {
+                    "workspace_id": ObjectId(workspace_id),
+                    "$or": [
+                        {"title": prefix},
+                        {"description": prefix},
+                        {"tags": prefix}
+                    ]
+                }
+            },
+            {"$project": {"title": 1}},
+            {"$limit": limit}
+        ]
+        
+        suggestions = []
+        async for doc in db.documents.aggregate(pipeline):
+            suggestions.append({
+                "text": doc["title"],
+                "type": "document",
+                "document_id": str(doc["_id"])
+            })
+        
+        return suggestions
+    
     async def get_document_stats(self, workspace_id: str) -> Dict[str, Any]:
         """Get document statistics for workspace"""
         db = get_database()
         
+        # One group per (type, status) pair, so the breakdowns never depend on
+        # every document carrying both fields
         pipeline = [
             {"$match": {"workspace_id": ObjectId(workspace_id)}},
             {
                 "$group": {
-                    "_id": None,
-                    "total_documents": {"$sum": 1},
+                    "_id": {"type": "$document_type", "status": "$status"},
+                    "count": {"$sum": 1},
                     "total_size": {"$sum": "$file_size"},
                     "total_chunks": {"$sum": "$chunk_count"},
-                    "avg_access_count": {"$avg": "$access_count"},
-                    "document_types": {"$push": "$document_type"},
-                    "statuses": {"$push": "$status"}
+                    "access_total": {"$sum": "$access_count"},
+                    "access_docs": {"$sum": {"$cond": [{"$gt": ["$access_count", None]}, 1, 0]}}
                 }
             }
         ]
         
-        result = await db.documents.aggregate(pipeline).to_list(1)
-        
-        if not result:
-            return {
-                "total_documents": 0,
-                "total_size": 0,
-                "total_chunks": 0,
-                "avg_access_count": 0,
-                "type_breakdown": {},
-                "status_breakdown": {}
-            }
-        
-        stats = result[0]
-        
-        # Calculate type breakdown
+        total_documents = 0
+        total_size = 0
+        total_chunks = 0
+        access_total = 0
+        access_docs = 0
         type_breakdown = {}
-        for doc_type in stats.get("document_types", []):
-            type_breakdown[doc_type] = type_breakdown.get(doc_type, 0) + 1
-        
-        # Calculate status breakdown
         status_breakdown = {}
-        for status in stats.get("statuses", []):
-            status_breakdown[status] = status_breakdown.get(status, 0) + 1
+        async for group in db.documents.aggregate(pipeline):
+            count = group["count"]
+            total_documents += count
+            total_size += group["total_size"]
+            total_chunks += group["total_chunks"]
+            access_total += group["access_total"]
+            access_docs += group["access_docs"]
+            
+            doc_type = group["_id"].get("type")
+            doc_status = group["_id"].get("status")
+            if doc_type is not None:
+                type_breakdown[doc_type] = type_breakdown.get(doc_type, 0) + count
+            if doc_status is not None:
+                status_breakdown[doc_status] = status_breakdown.get(doc_status, 0) + count
         
         return {
-            "total_documents": stats.get("total_documents", 0),
-            "total_size": stats.get("total_size", 0),
-            "total_chunks": stats.get("total_chunks", 0),
-            "avg_access_count": round(stats.get("avg_access_count", 0), 2),
+            "total_documents": total_documents,
+            "total_size": total_size,
+            "total_chunks": total_chunks,
+            "avg_access_count": round(access_total / access_docs, 2) if access_docs else 0,
             "type_breakdown": type_breakdown,
             "status_breakdown": status_breakdown
         }
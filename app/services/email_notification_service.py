@@ -1,6 +1,6 @@
 import os
 import pandas as pd
-import smtplib
+import aiosmtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
@@ -13,14 +13,15 @@ from app.models.email_config import EmailConfig, EmailLog, EmailLogCreate
 from bson import ObjectId
 import logging
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 import pytz
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on one SMTP conversation so a hung server cannot hold a send forever
+SMTP_TIMEOUT_SECONDS = 10
+
 class EmailNotificationService:
     def __init__(self):
-        self.executor = ThreadPoolExecutor(max_workers=2)
         self.reports_dir = "email_reports"
         os.makedirs(self.reports_dir, exist_ok=True)
     
@@ -370,22 +371,22 @@ WhatsApp AI Automation Team
             return False
     
     async def _send_smtp_email(self, msg: MIMEMultipart):
-        """Send email using SMTP in thread pool"""
-        def send_email():
-            try:
-                server = smtplib.SMTP(settings.smtp_server, settings.smtp_port)
-                server.starttls()
-                server.login(settings.smtp_username, settings.smtp_password)
-                server.send_message(msg)
-                server.quit()
-                return True
-            except Exception as e:
-                logger.error(f"SMTP error: {e}")
-                raise
-        
-        # Run in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(self.executor, send_email)
+        """Send email over SMTP without blocking the event loop"""
+        try:
+            await asyncio.wait_for(
+                aiosmtplib.send(
+                    msg,
+                    hostname=settings.smtp_server,
+                    port=settings.smtp_port,
+                    start_tls=True,
+                    username=settings.smtp_username,
+                    password=settings.smtp_password
+                ),
+                timeout=SMTP_TIMEOUT_SECONDS
+            )
+        except Exception as e:
+            logger.error(f"SMTP error: {e}")
+            raise
     
     async def _update_last_email_timestamp(self, config_id: str):
         """Update the last email sent timestamp for a configuration"""
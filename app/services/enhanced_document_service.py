@@ -9,6 +9,7 @@ from app.services.document_service import DocumentService
 from app.services.excel_processor import excel_processor
 from app.models.document import DocumentType
 from datetime import datetime
+from app.utils.embedding_helpers import pack_embedding
 
 logger = logging.getLogger(__name__)
 
@@ -99,7 +100,7 @@ class EnhancedDocumentService(DocumentService):
                             "workspace_id": ObjectId(workspace_id),
                             "content": chunk_content,
                             "chunk_index": i,
-                            "embedding": embedding,
+                            "embedding": pack_embedding(embedding),
                             "metadata": combined_metadata,
                             "created_at": datetime.utcnow()
                         }
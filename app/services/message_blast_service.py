@@ -1,21 +1,45 @@
-import pandas as pd
 import os
 import tempfile
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from app.models.message_blast import (
     MessageBlast, MessageBlastCreate, MessageBlastUpdate, BlastTarget, 
-    BlastTargetCreate, BlastStatus, MessageStatus, BlastProgress
+    BlastTargetCreate, BlastStatus, MessageStatus, BlastProgress,
+    MessageBlastSummary, MESSAGE_BLAST_SUMMARY_PROJECTION
 )
+from app.config import settings
 from app.database import get_database
 from app.services.whatsapp_service import whatsapp_service
+from app.utils.phone_excel_helpers import clean_phone_number, is_valid_phone_format, parse_phone_numbers_from_excel
+from app.utils.request_helpers import cached_object_id
 from bson import ObjectId
+from concurrent.futures import ProcessPoolExecutor
 import logging
 import asyncio
-import re
+import multiprocessing
 
 logger = logging.getLogger(__name__)
 
+# Excel parsing is CPU-bound; separate processes let uploads parse in parallel.
+# Created on first upload and spawned (not forked) so children never inherit
+# Motor or bcrypt pool threads.
+_parser_pool: Optional[ProcessPoolExecutor] = None
+# Caps parses in flight (each can hold a large workbook); extra uploads wait here
+_PARSE_SEM = asyncio.Semaphore(settings.blast_parse_concurrency)
+
+def _get_parser_pool() -> ProcessPoolExecutor:
+    """Return the parser pool, creating it on first use"""
+    global _parser_pool
+    if _parser_pool is None:
+        _parser_pool = ProcessPoolExecutor(
+            max_workers=settings.blast_parse_concurrency,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _parser_pool
+
+TARGET_INSERT_CHUNK_SIZE = 1000
+TARGET_INSERT_CONCURRENCY = 4
+
 class MessageBlastService:
     def __init__(self):
         self.max_phone_numbers = 1000
@@ -51,7 +75,7 @@ class MessageBlastService:
             
             # Create blast record
             blast_dict = blast_data.dict()
-            blast_dict["workspace_id"] = ObjectId(blast_data.workspace_id)
+            blast_dict["workspace_id"] = cached_object_id(blast_data.workspace_id)
             blast_dict["created_by"] = created_by
             blast_dict["created_at"] = datetime.utcnow()
             blast_dict["updated_at"] = datetime.utcnow()
@@ -81,67 +105,33 @@ class MessageBlastService:
             raise
     
     async def upload_phone_numbers_from_excel(self, file_path: str, filename: str) -> List[str]:
-        """Extract phone numbers from uploaded Excel file"""
-        try:
-            logger.info(f"Processing Excel file for phone numbers: {filename}")
-            
-            # Read Excel file
-            if filename.lower().endswith('.xlsx'):
-                df = pd.read_excel(file_path, engine='openpyxl')
-            elif filename.lower().endswith('.xls'):
-                df = pd.read_excel(file_path, engine='xlrd')
-            else:
-                raise ValueError("File must be .xlsx or .xls format")
-            
-            phone_numbers = []
-            
-            # Look for phone number columns
-            phone_columns = []
-            for col in df.columns:
-                col_lower = str(col).lower()
-                if any(keyword in col_lower for keyword in ['phone', 'mobile', 'number', 'contact']):
-                    phone_columns.append(col)
-            
-            if not phone_columns:
-                # If no obvious phone column, use first column
-                phone_columns = [df.columns[0]]
-            
-            # Extract phone numbers from identified columns
-            for col in phone_columns:
-                for value in df[col].dropna():
-                    phone_str = str(value).strip()
-                    if phone_str and self._is_valid_phone_format(phone_str):
-                        cleaned_phone = self._clean_phone_number(phone_str)
-                        if cleaned_phone and cleaned_phone not in phone_numbers:
-                            phone_numbers.append(cleaned_phone)
-            
-            if len(phone_numbers) > self.max_phone_numbers:
-                raise ValueError(f"Too many phone numbers. Maximum {self.max_phone_numbers} allowed")
-            
-            logger.info(f"Extracted {len(phone_numbers)} valid phone numbers from Excel")
-            return phone_numbers
-            
-        except Exception as e:
-            logger.error(f"Failed to process Excel file: {e}")
-            raise
+        """Extract phone numbers from uploaded Excel file in the parser pool"""
+        loop = asyncio.get_running_loop()
+        async with _PARSE_SEM:
+            return await loop.run_in_executor(
+                _get_parser_pool(), parse_phone_numbers_from_excel,
+                file_path, filename, self.max_phone_numbers
+            )
     
-    async def get_workspace_blasts(self, workspace_id: str) -> List[MessageBlast]:
-        """Get all message blasts for a workspace"""
+    async def get_workspace_blasts(self, workspace_id: str) -> List[MessageBlastSummary]:
+        """Get list-view summaries of all message blasts for a workspace"""
         db = get_database()
-        cursor = db.message_blasts.find({"workspace_id": ObjectId(workspace_id)}).sort("created_at", -1)
+        cursor = db.message_blasts.find(
+            {"workspace_id": cached_object_id(workspace_id)},
+            MESSAGE_BLAST_SUMMARY_PROJECTION
+        ).sort("created_at", -1)
         
         blasts = []
         async for blast in cursor:
             blast["_id"] = str(blast["_id"])
-            blast["workspace_id"] = workspace_id
-            blasts.append(MessageBlast(**blast))
+            blasts.append(MessageBlastSummary(**blast))
         
         return blasts
     
     async def get_blast_by_id(self, blast_id: str) -> Optional[MessageBlast]:
         """Get message blast by ID"""
         db = get_database()
-        blast_data = await db.message_blasts.find_one({"_id": ObjectId(blast_id)})
+        blast_data = await db.message_blasts.find_one({"_id": cached_object_id(blast_id)})
         
         if not blast_data:
             return None
@@ -164,7 +154,7 @@ class MessageBlastService:
         update_dict["updated_at"] = datetime.utcnow()
         
         result = await db.message_blasts.update_one(
-            {"_id": ObjectId(blast_id)},
+            {"_id": cached_object_id(blast_id)},
             {"$set": update_dict}
         )
         
@@ -186,7 +176,7 @@ class MessageBlastService:
         await db.blast_targets.delete_many({"blast_id": blast_id})
         
         # Delete blast
-        result = await db.message_blasts.delete_one({"_id": ObjectId(blast_id)})
+        result = await db.message_blasts.delete_one({"_id": cached_object_id(blast_id)})
         
         return result.deleted_count > 0
     
@@ -208,9 +198,9 @@ class MessageBlastService:
             }}
         ]
         
-        status_counts = {}
-        async for result in db.blast_targets.aggregate(pipeline):
-            status_counts[result["_id"]] = result["count"]
+        # At most one row per target status, so fetch them in one batch
+        results = await db.blast_targets.aggregate(pipeline).to_list(length=len(MessageStatus))
+        status_counts = {result["_id"]: result["count"] for result in results}
         
         total_targets = sum(status_counts.values())
         pending_count = status_counts.get(MessageStatus.PENDING, 0)
@@ -263,15 +253,17 @@ class MessageBlastService:
             if blast.status != BlastStatus.SCHEDULED:
                 raise ValueError("Can only start scheduled blasts")
             
-            # Update status to active
+            # Update status to active; only one caller wins if starts race
             db = get_database()
-            await db.message_blasts.update_one(
-                {"_id": ObjectId(blast_id)},
+            result = await db.message_blasts.update_one(
+                {"_id": cached_object_id(blast_id), "status": BlastStatus.SCHEDULED},
                 {"$set": {
                     "status": BlastStatus.ACTIVE,
                     "updated_at": datetime.utcnow()
                 }}
             )
+            if result.modified_count == 0:
+                return False
             
             # Start processing in background
             asyncio.create_task(self._process_blast_batches(blast_id))
@@ -288,7 +280,7 @@ class MessageBlastService:
         db = get_database()
         
         result = await db.message_blasts.update_one(
-            {"_id": ObjectId(blast_id), "status": BlastStatus.ACTIVE},
+            {"_id": cached_object_id(blast_id), "status": BlastStatus.ACTIVE},
             {"$set": {
                 "status": BlastStatus.PAUSED,
                 "updated_at": datetime.utcnow()
@@ -302,7 +294,7 @@ class MessageBlastService:
         db = get_database()
         
         result = await db.message_blasts.update_one(
-            {"_id": ObjectId(blast_id), "status": BlastStatus.PAUSED},
+            {"_id": cached_object_id(blast_id), "status": BlastStatus.PAUSED},
             {"$set": {
                 "status": BlastStatus.ACTIVE,
                 "updated_at": datetime.utcnow()
@@ -321,7 +313,7 @@ class MessageBlastService:
         db = get_database()
         
         result = await db.message_blasts.update_one(
-            {"_id": ObjectId(blast_id), "status": {"$in": [BlastStatus.ACTIVE, BlastStatus.SCHEDULED, BlastStatus.PAUSED]}},
+            {"_id": cached_object_id(blast_id), "status": {"$in": [BlastStatus.ACTIVE, BlastStatus.SCHEDULED, BlastStatus.PAUSED]}},
             {"$set": {
                 "status": BlastStatus.CANCELLED,
                 "updated_at": datetime.utcnow(),
@@ -372,7 +364,7 @@ class MessageBlastService:
             db = get_database()
             
             # Get sender phone details
-            sender_phone = await db.phone_numbers.find_one({"_id": ObjectId(blast.sender_phone_id)})
+            sender_phone = await db.phone_numbers.find_one({"_id": cached_object_id(blast.sender_phone_id)})
             if not sender_phone:
                 raise ValueError("Sender phone not found")
             
@@ -412,7 +404,7 @@ class MessageBlastService:
                         
                         # Update blast sent count
                         await db.message_blasts.update_one(
-                            {"_id": ObjectId(blast_id)},
+                            {"_id": cached_object_id(blast_id)},
                             {"$inc": {"sent_count": 1}}
                         )
                         
@@ -430,7 +422,7 @@ class MessageBlastService:
                         
                         # Update blast failed count
                         await db.message_blasts.update_one(
-                            {"_id": ObjectId(blast_id)},
+                            {"_id": cached_object_id(blast_id)},
                             {"$inc": {"failed_count": 1}}
                         )
                         
@@ -454,7 +446,7 @@ class MessageBlastService:
                     
                     # Update blast failed count
                     await db.message_blasts.update_one(
-                        {"_id": ObjectId(blast_id)},
+                        {"_id": cached_object_id(blast_id)},
                         {"$inc": {"failed_count": 1}}
                     )
             
@@ -467,7 +459,7 @@ class MessageBlastService:
         db = get_database()
         
         await db.message_blasts.update_one(
-            {"_id": ObjectId(blast_id)},
+            {"_id": cached_object_id(blast_id)},
             {"$set": {
                 "status": BlastStatus.COMPLETED,
                 "completed_at": datetime.utcnow(),
@@ -482,7 +474,7 @@ class MessageBlastService:
         db = get_database()
         
         await db.message_blasts.update_one(
-            {"_id": ObjectId(blast_id)},
+            {"_id": cached_object_id(blast_id)},
             {"$set": {
                 "status": BlastStatus.FAILED,
                 "completed_at": datetime.utcnow(),
@@ -496,32 +488,43 @@ class MessageBlastService:
     async def _create_blast_targets(self, blast_id: str, phone_numbers: List[str]):
         """Create target records for blast"""
         db = get_database()
+        now = datetime.utcnow()
         
-        targets = []
-        for i, phone_number in enumerate(phone_numbers):
-            batch_number = (i // 5) + 1  # Assuming default batch size for calculation
-            
-            target = {
+        targets = [
+            {
                 "blast_id": blast_id,
                 "phone_number": phone_number,
                 "status": MessageStatus.PENDING,
-                "batch_number": batch_number,
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
+                "batch_number": (i // 5) + 1,  # Assuming default batch size for calculation
+                "created_at": now,
+                "updated_at": now
             }
-            targets.append(target)
+            for i, phone_number in enumerate(phone_numbers)
+        ]
+        
+        if not targets:
+            return
         
-        if targets:
-            await db.blast_targets.insert_many(targets)
-            logger.info(f"Created {len(targets)} target records for blast {blast_id}")
+        # Unordered chunks let the server apply each batch in parallel; a few run concurrently
+        semaphore = asyncio.Semaphore(TARGET_INSERT_CONCURRENCY)
+        
+        async def insert_chunk(chunk: List[Dict]):
+            async with semaphore:
+                await db.blast_targets.insert_many(chunk, ordered=False)
+        
+        await asyncio.gather(*(
+            insert_chunk(targets[start:start + TARGET_INSERT_CHUNK_SIZE])
+            for start in range(0, len(targets), TARGET_INSERT_CHUNK_SIZE)
+        ))
+        logger.info(f"Created {len(targets)} target records for blast {blast_id}")
     
     async def _validate_sender_phone(self, phone_id: str, workspace_id: str):
         """Validate that sender phone exists and is connected"""
         db = get_database()
         
         phone = await db.phone_numbers.find_one({
-            "_id": ObjectId(phone_id),
-            "workspace_id": ObjectId(workspace_id)
+            "_id": cached_object_id(phone_id),
+            "workspace_id": cached_object_id(workspace_id)
         })
         
         if not phone:
@@ -532,35 +535,14 @@ class MessageBlastService:
     
     async def _clean_phone_numbers(self, phone_numbers: List[str]) -> List[str]:
         """Clean and validate phone numbers"""
-        cleaned = []
+        cleaned: Dict[str, None] = {}
         
         for phone in phone_numbers:
-            cleaned_phone = self._clean_phone_number(phone)
-            if cleaned_phone and self._is_valid_phone_format(cleaned_phone):
-                if cleaned_phone not in cleaned:  # Remove duplicates
-                    cleaned.append(cleaned_phone)
-        
-        return cleaned
-    
-    def _clean_phone_number(self, phone: str) -> str:
-        """Clean a single phone number"""
-        # Remove all non-digit characters except +
-        cleaned = re.sub(r'[^\d+]', '', str(phone).strip())
-        
-        # Ensure it starts with +
-        if cleaned and not cleaned.startswith('+'):
-            cleaned = '+' + cleaned
+            cleaned_phone = clean_phone_number(phone)
+            if cleaned_phone and is_valid_phone_format(cleaned_phone):
+                cleaned[cleaned_phone] = None  # Remove duplicates, keep order
         
-        return cleaned
-    
-    def _is_valid_phone_format(self, phone: str) -> bool:
-        """Validate phone number format"""
-        if not phone or len(phone) < 8:
-            return False
-        
-        # Basic international phone number validation
-        pattern = r'^\+[1-9]\d{7,14}$'
-        return bool(re.match(pattern, phone))
+        return list(cleaned)
     
     async def get_blast_targets(self, blast_id: str, status: Optional[str] = None) -> List[BlastTarget]:
         """Get targets for a blast with optional status filter"""
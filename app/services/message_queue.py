@@ -11,6 +11,7 @@ from app.models.chat import MessageCreate, MessageDirection
 from app.services.chat_service import chat_service
 from app.services.whatsapp_service import whatsapp_service
 from bson import ObjectId
+from pymongo import UpdateOne
 import traceback
 
 logger = logging.getLogger(__name__)
@@ -367,5 +368,50 @@ class MessageQueue:
         except Exception as e:
             logger.error(f"Failed to cleanup old messages: {e}")
 
+    async def rollup_hourly_stats(self, hours: int = 24):
+        """Refresh per-hour status counts in message_queue_hourly for the last `hours` hours"""
+        db = get_database()
+        refreshed_at = datetime.utcnow()
+        window_start = (refreshed_at - timedelta(hours=hours)).replace(minute=0, second=0, microsecond=0)
+        
+        pipeline = [
+            {"$match": {"created_at": {"$gte": window_start}}},
+            {
+                "$group": {
+                    "_id": {
+                        "hour_bucket": {
+                            "$dateFromParts": {
+                                "year": {"$year": "$created_at"},
+                                "month": {"$month": "$created_at"},
+                                "day": {"$dayOfMonth": "$created_at"},
+                                "hour": {"$hour": "$created_at"}
+                            }
+                        },
+                        "status": "$status"
+                    },
+                    "count": {"$sum": 1}
+                }
+            }
+        ]
+        results = await db.message_queue.aggregate(pipeline).to_list(None)
+        
+        if results:
+            await db.message_queue_hourly.bulk_write([
+                UpdateOne(
+                    {"hour_bucket": result["_id"]["hour_bucket"], "status": result["_id"]["status"]},
+                    {"$set": {"count": result["count"], "refreshed_at": refreshed_at}},
+                    upsert=True
+                )
+                for result in results
+            ], ordered=False)
+        
+        # Drop buckets outside the window and (hour, status) pairs that no longer have messages
+        await db.message_queue_hourly.delete_many({
+            "$or": [
+                {"hour_bucket": {"$lt": window_start}},
+                {"refreshed_at": {"$lt": refreshed_at}}
+            ]
+        })
+
 # Global message queue instance
 message_queue = MessageQueue()
\ No newline at end of file
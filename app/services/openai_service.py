@@ -7,7 +7,7 @@ from app.models.workspace import AISettings
 from app.models.workflow import WorkflowStep, WorkflowAnalysis
 import logging
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+from app.utils.embedding_helpers import cosine_similarity_score, unpack_embedding
 import json
 
 logger = logging.getLogger(__name__)
@@ -218,11 +218,9 @@ Generate a helpful response that moves the workflow forward:
             
             # Calculate similarities
             similarities = []
+            query_vector = unpack_embedding(query_embedding)
             for doc in docs_with_embeddings:
-                similarity = cosine_similarity(
-                    [query_embedding],
-                    [doc.embedding]
-                )[0][0]
+                similarity = cosine_similarity_score(query_vector, doc.embedding)
                 similarities.append((doc, similarity))
             
             # Sort by similarity and return top results
@@ -40,6 +40,16 @@ class SchedulerService:
                 max_instances=1
             )
             
+            # Hourly message queue stats rollup every minute
+            self.scheduler.add_job(
+                func=self._safe_hourly_rollup_job,
+                trigger=IntervalTrigger(minutes=1),
+                id='queue_hourly_rollup',
+                name='Roll Up Hourly Queue Stats',
+                max_instances=1,
+                coalesce=True
+            )
+            
             # Health check every 5 minutes
             self.scheduler.add_job(
                 func=self._safe_health_check_job,
@@ -98,6 +108,14 @@ class SchedulerService:
             logger.error(f"Scheduled cleanup failed: {e}")
             await self._log_job_failure("queue_cleanup", str(e))
     
+    async def _safe_hourly_rollup_job(self):
+        """Safely refresh the hourly message queue stats read by the monitoring API"""
+        try:
+            await message_queue.rollup_hourly_stats()
+        except Exception as e:
+            logger.error(f"Hourly queue stats rollup failed: {e}")
+            await self._log_job_failure("queue_hourly_rollup", str(e))
+    
     async def _safe_health_check_job(self):
         """Perform system health checks"""
         try:
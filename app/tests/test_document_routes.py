@@ -0,0 +1,53 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.auth.auth_handler import get_current_user
+from app.routes import documents
+
+WORKSPACE_ID = "0123456789abcdef01234567"
+
+class TestWorkspaceDocumentsPaging:
+    """Test suite for the paging bounds of the workspace documents list"""
+
+    @pytest.fixture
+    def client(self):
+        """Documents router with auth and workspace access stubbed out"""
+        app = FastAPI()
+        app.include_router(documents.router, prefix="/documents")
+        app.dependency_overrides[get_current_user] = lambda: object()
+        with patch.object(documents, "verify_workspace_access", AsyncMock(return_value=True)):
+            yield TestClient(app)
+
+    @pytest.mark.parametrize("params", [
+        {"limit": 0},
+        {"limit": -1},
+        {"limit": 101},
+        {"offset": -1},
+        {"limit": 0, "include_stats": "true"},
+    ])
+    def test_rejects_out_of_range_paging(self, client, params):
+        """limit must be 1-100 and offset non-negative, before any query runs"""
+        with patch.object(documents.document_service, "get_workspace_documents", AsyncMock()) as listing, \
+                patch.object(documents.document_service, "list_with_stats", AsyncMock()) as with_stats:
+            response = client.get(f"/documents/workspace/{WORKSPACE_ID}", params=params)
+
+        assert response.status_code == 422
+        listing.assert_not_awaited()
+        with_stats.assert_not_awaited()
+
+    @pytest.mark.parametrize("limit", [1, 100])
+    def test_accepts_limits_in_range(self, client, limit):
+        """The bounds themselves are valid page sizes"""
+        with patch.object(documents.document_service, "get_workspace_documents", AsyncMock(return_value=[])) as listing:
+            response = client.get(f"/documents/workspace/{WORKSPACE_ID}", params={"limit": limit, "offset": 0})
+
+        assert response.status_code == 200
+        assert response.json() == []
+        assert listing.await_args.kwargs["limit"] == limit
+
+    def test_rejects_zero_suggestion_limit(self, client):
+        """Search suggestions need a positive limit for their $limit stage"""
+        response = client.get(f"/documents/search/suggestions/{WORKSPACE_ID}", params={"query": "ab", "limit": 0})
+
+        assert response.status_code == 422
@@ -0,0 +1,88 @@
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+from fastapi import BackgroundTasks, HTTPException
+from app.models.user import User
+
+# The exports routes import the email service, which needs aiosmtplib
+pytest.importorskip("aiosmtplib")
+from app.routes import exports
+
+class FakeRedis:
+    """Just enough of redis.asyncio for the lock helpers"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, token):
+        if self.values.get(key) == token:
+            del self.values[key]
+            return 1
+        return 0
+
+def make_user(is_admin: bool) -> User:
+    """Build a user the way get_current_user loads one from Mongo"""
+    now = datetime.utcnow()
+    return User(**{
+        "_id": "0123456789abcdef01234567",
+        "email": "admin@example.com",
+        "full_name": "Admin",
+        "is_admin": is_admin,
+        "created_at": now,
+        "updated_at": now,
+    })
+
+class TestTriggerExportNow:
+    """Test suite for the system-wide manual export trigger"""
+
+    @pytest.fixture
+    def redis_client(self):
+        """Swap the queue's Redis client for an in-memory fake"""
+        fake = FakeRedis()
+        with patch.object(exports.message_queue, "redis_client", fake):
+            yield fake
+
+    @pytest.fixture
+    def export_all(self):
+        """Stub out the actual export"""
+        with patch.object(exports.excel_export_service, "export_all_workspace_messages", AsyncMock()) as export:
+            yield export
+
+    @pytest.mark.asyncio
+    async def test_second_trigger_is_deduplicated(self, redis_client, export_all):
+        """A trigger while an export is queued or running gets a 409; the lock frees afterwards"""
+        admin = make_user(is_admin=True)
+        first_tasks = BackgroundTasks()
+
+        first = await exports.trigger_export_now(first_tasks, current_user=admin)
+        assert first["queued"] is True
+
+        with pytest.raises(HTTPException) as second:
+            await exports.trigger_export_now(BackgroundTasks(), current_user=admin)
+        assert second.value.status_code == 409
+
+        await first_tasks()
+        export_all.assert_awaited_once()
+        assert redis_client.values == {}
+
+        third_tasks = BackgroundTasks()
+        third = await exports.trigger_export_now(third_tasks, current_user=admin)
+        assert third["queued"] is True
+        await third_tasks()
+        assert export_all.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_non_admin_is_forbidden(self, redis_client, export_all):
+        """Only global admins can trigger the export"""
+        with pytest.raises(HTTPException) as error:
+            await exports.trigger_export_now(BackgroundTasks(), current_user=make_user(is_admin=False))
+
+        assert error.value.status_code == 403
+        assert redis_client.values == {}
+        export_all.assert_not_awaited()
@@ -0,0 +1,198 @@
+import pytest
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from bson import ObjectId
+from app.services.chat_service import ChatService, MessageWriteBuffer
+
+CHAT_ID = str(ObjectId())
+
+def make_message(content: str, chat_id: str = CHAT_ID) -> dict:
+    """Build a message document the way ChatService.add_message does"""
+    return {
+        "_id": ObjectId(),
+        "chat_id": chat_id,
+        "content": content,
+        "direction": "incoming",
+        "sender_phone": "+1234567890",
+        "timestamp": datetime.utcnow(),
+        "is_ai_generated": False,
+    }
+
+class MockCursor:
+    """Async cursor over stored message documents"""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, *args, **kwargs):
+        return self
+
+    def __aiter__(self):
+        self._iter = iter(self.documents)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+class TestMessageWriteBuffer:
+    """Test suite for buffered chat message writes"""
+
+    @pytest.fixture
+    def mock_db(self):
+        """Patch the chat service database with mocked collections"""
+        db = MagicMock()
+        db.messages.bulk_write = AsyncMock()
+        db.messages.replace_one = AsyncMock()
+        db.chats.bulk_write = AsyncMock()
+        with patch("app.services.chat_service.get_database", return_value=db):
+            yield db
+
+    @pytest.mark.asyncio
+    async def test_enqueue_refuses_when_full(self, mock_db):
+        """A full buffer hands the message back for a direct write"""
+        buffer = MessageWriteBuffer(flush_interval=60, max_pending=1)
+
+        assert buffer.enqueue(make_message("first")) is True
+        assert buffer.enqueue(make_message("second")) is False
+        assert buffer.pending_chats == {CHAT_ID: 1}
+
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    async def test_drain_flushes_after_interval(self, mock_db):
+        """Queued messages are written by the drain task without an explicit flush"""
+        buffer = MessageWriteBuffer(flush_interval=0.01)
+        buffer.enqueue(make_message("hello"))
+
+        await asyncio.sleep(0.1)
+
+        mock_db.messages.bulk_write.assert_awaited_once()
+        mock_db.chats.bulk_write.assert_awaited_once()
+        assert not buffer.has_pending(CHAT_ID)
+
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    async def test_drain_sleeps_while_idle(self, mock_db):
+        """The drain task waits for new messages instead of polling an empty buffer"""
+        buffer = MessageWriteBuffer(flush_interval=0.01)
+        flush = AsyncMock(wraps=buffer.flush)
+        buffer.flush = flush
+        buffer.enqueue(make_message("hello"))
+
+        await asyncio.sleep(0.1)
+
+        assert flush.await_count == 1
+        assert not buffer.wakeup.is_set()
+        assert not buffer.drain_task.done()
+
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_messages_are_requeued(self, mock_db):
+        """Messages that fail both writes stay queued and pending for the next flush"""
+        mock_db.messages.bulk_write.side_effect = Exception("bulk write failed")
+        mock_db.messages.replace_one.side_effect = Exception("write failed")
+        buffer = MessageWriteBuffer(flush_interval=60)
+        message = make_message("hello")
+        buffer.enqueue(message)
+
+        assert await buffer.flush() == 1
+        assert buffer.has_pending(CHAT_ID)
+        assert buffer.queue.qsize() == 1
+        mock_db.chats.bulk_write.assert_not_awaited()
+
+        mock_db.messages.bulk_write.side_effect = None
+        assert await buffer.flush() == 0
+        assert not buffer.has_pending(CHAT_ID)
+        assert buffer.write_attempts == {}
+        assert mock_db.messages.bulk_write.await_args.args[0][0]._doc is message
+
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_messages_are_dropped_after_max_attempts(self, mock_db):
+        """A message that keeps failing is eventually dropped and no longer pending"""
+        mock_db.messages.bulk_write.side_effect = Exception("bulk write failed")
+        mock_db.messages.replace_one.side_effect = Exception("write failed")
+        buffer = MessageWriteBuffer(flush_interval=60, max_write_attempts=2)
+        buffer.enqueue(make_message("hello"))
+
+        assert await buffer.flush() == 1
+        assert await buffer.flush() == 0
+        assert buffer.queue.empty()
+        assert not buffer.has_pending(CHAT_ID)
+        assert buffer.write_attempts == {}
+
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    async def test_flush_falls_back_to_replace_one(self, mock_db):
+        """A failed bulk insert is retried as one idempotent upsert per message"""
+        mock_db.messages.bulk_write.side_effect = Exception("bulk write failed")
+        buffer = MessageWriteBuffer(flush_interval=60)
+        messages = [make_message("one"), make_message("two")]
+        for message in messages:
+            buffer.enqueue(message)
+
+        await buffer.flush()
+
+        assert mock_db.messages.replace_one.await_count == 2
+        for call, message in zip(mock_db.messages.replace_one.await_args_list, messages):
+            assert call.args == ({"_id": message["_id"]}, message)
+            assert call.kwargs == {"upsert": True}
+        assert not buffer.has_pending(CHAT_ID)
+
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    async def test_close_drains_queue(self, mock_db):
+        """Closing stops the drain task and writes everything still queued"""
+        buffer = MessageWriteBuffer(flush_interval=60)
+        buffer.enqueue(make_message("one"))
+        buffer.enqueue(make_message("two", chat_id=str(ObjectId())))
+        drain_task = buffer.drain_task
+
+        await buffer.close()
+        await asyncio.sleep(0)
+
+        assert drain_task.cancelled()
+        assert buffer.drain_task is None
+        assert buffer.queue.empty()
+        assert buffer.pending_chats == {}
+        operations = mock_db.messages.bulk_write.await_args.args[0]
+        assert len(operations) == 2
+        assert len(mock_db.chats.bulk_write.await_args.args[0]) == 2
+
+    @pytest.mark.asyncio
+    async def test_read_flushes_pending_messages(self, mock_db):
+        """Reading a chat writes its buffered messages before querying"""
+        stored = []
+        order = []
+
+        async def bulk_write(operations, ordered):
+            order.append("bulk_write")
+            stored.extend(operation._doc for operation in operations)
+
+        def find(query):
+            order.append("find")
+            return MockCursor([dict(doc) for doc in stored if doc["chat_id"] == query["chat_id"]])
+
+        mock_db.messages.bulk_write.side_effect = bulk_write
+        mock_db.messages.find = MagicMock(side_effect=find)
+
+        service = ChatService()
+        service.message_buffer = MessageWriteBuffer(flush_interval=60)
+        service.message_buffer.enqueue(make_message("hello"))
+
+        messages = await service._get_chat_messages(CHAT_ID)
+
+        assert order == ["bulk_write", "find"]
+        assert [message.content for message in messages] == ["hello"]
+        assert not service.message_buffer.has_pending(CHAT_ID)
+
+        await service.close()
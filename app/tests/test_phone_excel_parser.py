@@ -0,0 +1,117 @@
+import pytest
+import tempfile
+import os
+from app.utils.phone_excel_helpers import cell_to_text, iter_excel_rows, parse_phone_numbers_from_excel
+import openpyxl
+import xlwt
+
+def write_xlsx(rows) -> str:
+    """Write rows to a temporary XLSX file"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for row in rows:
+        ws.append(row)
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
+    temp_file.close()
+    wb.save(temp_file.name)
+    wb.close()
+    return temp_file.name
+
+def write_xls(rows) -> str:
+    """Write rows to a temporary XLS file"""
+    wb = xlwt.Workbook()
+    ws = wb.add_sheet("Contacts")
+    for row_idx, row in enumerate(rows):
+        for col_idx, value in enumerate(row):
+            if value is not None:
+                ws.write(row_idx, col_idx, value)
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xls')
+    temp_file.close()
+    wb.save(temp_file.name)
+    return temp_file.name
+
+class TestPhoneExcelParser:
+    """Test suite for extracting blast phone numbers from Excel uploads"""
+
+    @pytest.fixture(params=["xlsx", "xls"])
+    def excel_file(self, request):
+        """Build an Excel file of the parametrized format from rows"""
+        writer = write_xlsx if request.param == "xlsx" else write_xls
+        paths = []
+
+        def make(rows):
+            path = writer(rows)
+            paths.append(path)
+            return path, f"contacts.{request.param}"
+
+        yield make
+
+        # Cleanup
+        for path in paths:
+            os.unlink(path)
+
+    def test_uses_phone_header_columns_only(self, excel_file):
+        """Only columns whose header names a phone field are read"""
+        path, filename = excel_file([
+            ["Name", "Mobile Number", "Notes"],
+            ["Alice", "+14155550101", "+14155550999"],
+            ["Bob", "+14155550102", "call back"],
+        ])
+
+        assert parse_phone_numbers_from_excel(path, filename, 1000) == ["+14155550101", "+14155550102"]
+
+    def test_falls_back_to_first_column(self, excel_file):
+        """Without a phone-like header the first column is used"""
+        path, filename = excel_file([
+            ["Recipients", "Name"],
+            ["+14155550101", "Alice"],
+            ["+14155550102", "Bob"],
+        ])
+
+        assert parse_phone_numbers_from_excel(path, filename, 1000) == ["+14155550101", "+14155550102"]
+
+    def test_numeric_cells(self, excel_file):
+        """Numeric cells read as integer text; without a leading + they are rejected"""
+        path, filename = excel_file([
+            ["Phone"],
+            [14155550101],
+            ["+14155550102"],
+            [None],
+        ])
+
+        rows = list(iter_excel_rows(path, filename))
+        assert cell_to_text(rows[1][0]) == "14155550101"
+        assert parse_phone_numbers_from_excel(path, filename, 1000) == ["+14155550102"]
+
+    def test_deduplicates_column_by_column_in_first_seen_order(self, excel_file):
+        """Each phone column is listed in full before the next, keeping first occurrences"""
+        path, filename = excel_file([
+            ["Phone", "Contact"],
+            ["+14155550103", "+14155550201"],
+            ["+14155550101", "+14155550103"],
+            ["+14155550103", "+14155550202"],
+            ["+14155550102", "+14155550201"],
+        ])
+
+        assert parse_phone_numbers_from_excel(path, filename, 1000) == [
+            "+14155550103", "+14155550101", "+14155550102", "+14155550201", "+14155550202"
+        ]
+
+    def test_rejects_too_many_numbers(self, excel_file):
+        """More unique numbers than allowed is an error"""
+        path, filename = excel_file([["Phone"]] + [[f"+1415555{i:04d}"] for i in range(3)])
+
+        with pytest.raises(ValueError, match="Maximum 2"):
+            parse_phone_numbers_from_excel(path, filename, 2)
+
+    def test_cell_to_text(self):
+        """Whole-number floats lose their .0; other values are stripped text"""
+        assert cell_to_text(14155550101.0) == "14155550101"
+        assert cell_to_text(1.5) == "1.5"
+        assert cell_to_text("  +14155550101 ") == "+14155550101"
+        assert cell_to_text(None) == ""
+
+    def test_rejects_other_formats(self):
+        """Only .xlsx and .xls are read"""
+        with pytest.raises(ValueError, match=".xlsx or .xls"):
+            parse_phone_numbers_from_excel("contacts.csv", "contacts.csv", 1000)
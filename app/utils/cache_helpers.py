@@ -0,0 +1,85 @@
+"""
+Utility classes for caching slow-changing async results.
+
+Dashboards poll status endpoints far more often than their data changes.
+AsyncTTLCache keeps each result for a few seconds and lets only one
+coroutine per key recompute it on a miss; concurrent callers wait for that
+result instead of all hitting the database at once.
+
+redis_get_or_set does the same across workers for JSON-ready values. Redis
+is an optimisation only: without a client, or when it errors, the value is
+simply recomputed.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+from cachetools import TTLCache
+import asyncio
+import logging
+import orjson
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class AsyncTTLCache:
+    """TTL cache for awaitable results with a per-key lock on the miss path"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+
+    async def get_or_set(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """Return the cached value for key, computing it with factory on a miss; errors are not cached"""
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            try:
+                return self._cache[key]
+            except KeyError:
+                pass
+
+            try:
+                value = await factory()
+                self._cache[key] = value
+                return value
+            finally:
+                # Later misses start from a fresh lock; current waiters still share this one
+                if self._locks.get(key) is lock:
+                    del self._locks[key]
+
+    def clear(self):
+        """Drop every cached value"""
+        self._cache.clear()
+
+async def redis_get_or_set(redis_client, key: str, ttl_seconds: int, factory: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the JSON value cached in Redis under key, computing and storing it with factory on a miss"""
+    if redis_client is not None:
+        try:
+            cached = await redis_client.get(key)
+            if cached is not None:
+                return orjson.loads(cached)
+        except Exception as e:
+            logger.warning(f"Redis cache read failed for {key}: {e}")
+
+    value = await factory()
+
+    if redis_client is not None:
+        try:
+            await redis_client.set(key, orjson.dumps(value), ex=ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Redis cache write failed for {key}: {e}")
+
+    return value
+
+async def redis_invalidate(redis_client, *keys: str):
+    """Drop cached Redis values; failures are logged and ignored"""
+    if redis_client is None or not keys:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except Exception as e:
+        logger.warning(f"Redis cache invalidation failed for {keys}: {e}")
@@ -0,0 +1,48 @@
+"""
+Utility functions for packing and comparing embedding vectors.
+
+Embeddings are stored and carried as little-endian float32 bytes. Documents
+written before this format still hold plain float lists; every helper here
+accepts either form. JSON responses still expose embeddings as float arrays.
+"""
+
+from typing import Any, Optional, Sequence, Union
+import numpy as np
+
+EMBEDDING_DTYPE = np.dtype("<f4")
+
+EmbeddingValue = Union[bytes, Sequence[float], np.ndarray]
+
+def pack_embedding(values: EmbeddingValue) -> bytes:
+    """Pack an embedding into little-endian float32 bytes"""
+    if isinstance(values, (bytes, bytearray, memoryview)):
+        return bytes(values)
+    return np.asarray(values, dtype=EMBEDDING_DTYPE).tobytes()
+
+def unpack_embedding(value: EmbeddingValue) -> np.ndarray:
+    """Return an embedding as a contiguous float32 array without copying bytes"""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return np.frombuffer(value, dtype=EMBEDDING_DTYPE)
+    return np.asarray(value, dtype=EMBEDDING_DTYPE)
+
+def coerce_embedding(value: Any) -> Optional[bytes]:
+    """Pydantic before-validator accepting packed bytes or legacy float lists"""
+    if value is None:
+        return None
+    return pack_embedding(value)
+
+def embedding_to_list(value: bytes) -> list:
+    """JSON serializer keeping the API contract of embeddings as float arrays"""
+    return unpack_embedding(value).tolist()
+
+def cosine_similarity_score(query: EmbeddingValue, embedding: EmbeddingValue) -> float:
+    """Cosine similarity of two embeddings; 0.0 when either vector is empty or zero"""
+    query_vector = unpack_embedding(query)
+    vector = unpack_embedding(embedding)
+    if query_vector.size == 0 or query_vector.shape != vector.shape:
+        return 0.0
+
+    norm = float(np.linalg.norm(query_vector) * np.linalg.norm(vector))
+    if norm == 0.0:
+        return 0.0
+    return float(np.dot(query_vector, vector)) / norm
@@ -0,0 +1,43 @@
+"""
+Utility functions for short-lived Redis locks around heavy one-off jobs.
+
+A lock is a plain SET NX EX key holding a random token; it expires on its
+own if the holder dies, and is only released by the holder that set it.
+Without a Redis client, or when Redis errors, the helpers grant the lock,
+so a missing Redis degrades to no deduplication rather than to refusing work.
+"""
+
+from typing import Optional
+from redis.exceptions import RedisError
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+async def acquire_lock(redis_client, key: str, ttl_seconds: int) -> Optional[str]:
+    """Take the lock; returns its token, or None if someone else holds it"""
+    token = uuid.uuid4().hex
+    if redis_client is None:
+        return token
+    try:
+        acquired = await redis_client.set(key, token, nx=True, ex=ttl_seconds)
+    except RedisError as e:
+        logger.warning(f"Redis lock acquire failed for {key}, proceeding without it: {e}")
+        return token
+    return token if acquired else None
+
+async def release_lock(redis_client, key: str, token: str):
+    """Release the lock if it is still held with this token"""
+    if redis_client is None:
+        return
+    try:
+        await redis_client.eval(_RELEASE_SCRIPT, 1, key, token)
+    except RedisError as e:
+        logger.warning(f"Redis lock release failed for {key}; it expires on its own: {e}")
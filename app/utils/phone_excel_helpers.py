@@ -0,0 +1,115 @@
+"""
+Utility functions for reading blast phone numbers out of Excel uploads.
+
+parse_phone_numbers_from_excel runs in spawned parser processes, so this
+module must stay importable without the database, Redis or app services.
+"""
+
+from typing import Dict, Iterator, List, Tuple
+import logging
+import re
+import openpyxl
+import xlrd
+
+logger = logging.getLogger(__name__)
+
+# Compiled once; the Excel parser validates every cell with these
+_PHONE_RE = re.compile(r'\+[1-9]\d{7,14}')
+_NON_PHONE_CHARS_RE = re.compile(r'[^\d+]')
+
+PHONE_COLUMN_KEYWORDS = ('phone', 'mobile', 'number', 'contact')
+
+def clean_phone_number(phone: str) -> str:
+    """Clean a single phone number"""
+    # Remove all non-digit characters except +
+    cleaned = _NON_PHONE_CHARS_RE.sub('', str(phone).strip())
+
+    # Ensure it starts with +
+    if cleaned and not cleaned.startswith('+'):
+        cleaned = '+' + cleaned
+
+    return cleaned
+
+def is_valid_phone_format(phone: str) -> bool:
+    """Validate phone number format"""
+    if not phone or len(phone) < 8:
+        return False
+
+    # Basic international phone number validation
+    return _PHONE_RE.fullmatch(phone) is not None
+
+def cell_to_text(value) -> str:
+    """Render a cell as text; whole-number floats (how xls stores numbers) drop their .0"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+def iter_excel_rows(file_path: str, filename: str) -> Iterator[Tuple]:
+    """Yield the first sheet's rows as value tuples without loading the whole workbook"""
+    if filename.lower().endswith('.xlsx'):
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            yield from workbook.worksheets[0].iter_rows(values_only=True)
+        finally:
+            workbook.close()
+    elif filename.lower().endswith('.xls'):
+        workbook = xlrd.open_workbook(file_path, on_demand=True)
+        try:
+            sheet = workbook.sheet_by_index(0)
+            for row_index in range(sheet.nrows):
+                yield tuple(sheet.row_values(row_index))
+        finally:
+            workbook.release_resources()
+    else:
+        raise ValueError("File must be .xlsx or .xls format")
+
+def parse_phone_numbers_from_excel(file_path: str, filename: str, max_phone_numbers: int) -> List[str]:
+    """Extract unique phone numbers from an Excel file, column by column in first-seen order (blocking)"""
+    try:
+        logger.info(f"Processing Excel file for phone numbers: {filename}")
+
+        # Stream rows; the header row decides which columns hold phone numbers
+        rows = iter_excel_rows(file_path, filename)
+        header = next(rows, None)
+        if header is None:
+            return []
+
+        # Look for phone number columns
+        phone_columns = [
+            index for index, col in enumerate(header)
+            if any(keyword in str(col).lower() for keyword in PHONE_COLUMN_KEYWORDS)
+        ]
+
+        if not phone_columns:
+            # If no obvious phone column, use first column
+            phone_columns = [0]
+
+        # Rows are streamed, but numbers are collected per column so the result
+        # lists a whole column before the next one; dict keys keep first-seen
+        # order and make the duplicate check O(1)
+        column_numbers: List[Dict[str, None]] = [{} for _ in phone_columns]
+        for row in rows:
+            for col, numbers in zip(phone_columns, column_numbers):
+                phone_str = cell_to_text(row[col] if col < len(row) else None)
+                if phone_str and is_valid_phone_format(phone_str):
+                    cleaned_phone = clean_phone_number(phone_str)
+                    if cleaned_phone:
+                        numbers[cleaned_phone] = None
+                        if len(numbers) > max_phone_numbers:
+                            raise ValueError(f"Too many phone numbers. Maximum {max_phone_numbers} allowed")
+
+        phone_numbers: Dict[str, None] = {}
+        for numbers in column_numbers:
+            phone_numbers.update(numbers)
+
+        if len(phone_numbers) > max_phone_numbers:
+            raise ValueError(f"Too many phone numbers. Maximum {max_phone_numbers} allowed")
+
+        logger.info(f"Extracted {len(phone_numbers)} valid phone numbers from Excel")
+        return list(phone_numbers)
+
+    except Exception as e:
+        logger.error(f"Failed to process Excel file: {e}")
+        raise
@@ -0,0 +1,58 @@
+"""
+Utility functions for parsing request bodies straight from raw JSON.
+
+Routes that take a JSON body can skip FastAPI's json.loads -> dict -> model
+pipeline and let pydantic-core parse and validate the bytes in one pass.
+"""
+
+from typing import Any, Dict, Type, TypeVar
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+import functools
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+async def parse_json_body(request: Request, model: Type[ModelT]) -> ModelT:
+    """Validate the raw request body against a model; errors surface as the usual 422"""
+    body = await request.body()
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as e:
+        errors = [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        raise RequestValidationError(errors, body=body)
+
+def _inline_refs(schema: Any, defs: Dict[str, Any]) -> Any:
+    """Replace local $defs references so the schema can sit inside an OpenAPI operation"""
+    if isinstance(schema, dict):
+        ref = schema.get("$ref")
+        if isinstance(ref, str) and ref.startswith("#/$defs/"):
+            return _inline_refs(defs[ref.split("/")[-1]], defs)
+        return {key: _inline_refs(value, defs) for key, value in schema.items() if key != "$defs"}
+    if isinstance(schema, list):
+        return [_inline_refs(item, defs) for item in schema]
+    return schema
+
+def json_body_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """openapi_extra documenting a JSON body that is parsed with parse_json_body"""
+    schema = model.model_json_schema()
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _inline_refs(schema, schema.get("$defs", {}))}}
+        }
+    }
+
+def parse_object_id(value: str, detail: str = "Invalid ID") -> ObjectId:
+    """Parse a path/query id once per request; malformed ids are a 400, not a 500"""
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+@functools.lru_cache(maxsize=4096)
+def cached_object_id(value: str) -> ObjectId:
+    """ObjectId for an id string that trusted code parses repeatedly; bounded to 4096 ids (~0.5 MB)"""
+    return ObjectId(value)
@@ -0,0 +1,29 @@
+"""
+Utility functions for streaming Mongo cursors out as HTTP response bodies.
+
+Rows are encoded one at a time with orjson so memory stays bounded by a
+single document regardless of page size. ObjectIds and any other
+non-JSON values fall back to str().
+"""
+
+from typing import Any, AsyncIterable, AsyncIterator, Dict
+import orjson
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def encode_row(row: Dict[str, Any]) -> bytes:
+    """Encode one Mongo document as JSON bytes"""
+    return orjson.dumps(row, default=str)
+
+async def ndjson_stream(rows: AsyncIterable[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Yield each row as one newline-terminated JSON line"""
+    async for row in rows:
+        yield encode_row(row) + b"\n"
+
+async def json_array_stream(rows: AsyncIterable[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Yield rows as the pieces of a single JSON array"""
+    separator = b"["
+    async for row in rows:
+        yield separator + encode_row(row)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"